@@ -3,102 +3,259 @@ API client for Raspberry Pi Plant Monitoring System
 Handles all communication with the backend server
 """
 
-import requests
+import atexit
+import httpx
+import orjson
+import gzip
+import logging
 import time
-import json
-from datetime import datetime
-from typing import Optional, Dict, List
-from io import BytesIO
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, Callable, Iterator, Optional, Dict, List
 
-from config import *
+from config import CFG
+from telemetry_buffer import TelemetryBuffer
+
+logger = logging.getLogger(__name__)
+
+def _ts_ms() -> int:
+    """Current UTC time as integer epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+
+# Headers for gzip-compressed JSON bodies (telemetry, command acks)
+GZIP_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Content-Encoding': 'gzip'
+}
 
 
 class APIClient:
     """Handles all API communication with backend server"""
     
-    def __init__(self):
-        """Initialize API client"""
-        try:
-            self.base_url = API_BASE_URL.rstrip('/')
-        except NameError:
-            raise RuntimeError("API_BASE_URL not found in config. Make sure config.py is imported correctly.")
-        
-        try:
-            self.device_token = DEVICE_TOKEN
-        except NameError:
-            raise RuntimeError("DEVICE_TOKEN not found in config. Make sure config.py is imported correctly.")
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        Initialize API client
         
-        try:
-            self.device_id = DEVICE_ID
-        except NameError:
-            raise RuntimeError("DEVICE_ID not found in config. Make sure config.py is imported correctly.")
+        Args:
+            base_url: Backend URL override (defaults to CFG.API_BASE_URL)
+        """
+        self.base_url = (base_url or CFG.API_BASE_URL).rstrip('/')
+        self.device_token = CFG.DEVICE_TOKEN
+        self.device_id = CFG.DEVICE_ID
+        
+        # One HTTP/2 client for the process lifetime so telemetry, image
+        # uploads and command polls multiplex over a single TLS connection.
+        # Connection failures are retried inside the transport's pool.
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=CFG.API_MAX_RETRIES,
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+        self.client = httpx.Client(
+            transport=transport,
+            base_url=self.base_url,
+            headers={
+                'Authorization': f'Bearer {self.device_token}',
+                'User-Agent': f'PlantMonitor-RaspberryPi/{self.device_id}'
+            },
+            timeout=CFG.API_REQUEST_TIMEOUT
+        )
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.device_token}',
-            'User-Agent': f'PlantMonitor-RaspberryPi/{self.device_id}'
-        })
+        # Background telemetry delivery: readings are queued and drained by a
+        # worker so the main loop never blocks on the network. The queue lives
+        # in SQLite so unsent samples survive a reboot; it drops the oldest
+        # samples during long outages.
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='api')
+        self._telemetry_queue = TelemetryBuffer(CFG.TELEMETRY_BUFFER_DB, CFG.TELEMETRY_QUEUE_SIZE)
+        # Reentrant: close() from a signal handler can interrupt enqueue_telemetry()
+        self._telemetry_lock = threading.RLock()
+        self._drain_lock = threading.Lock()  # one upload of buffered rows at a time
+        self._batch_started = None  # monotonic time the current batch began
+        self._batch_count = 0       # samples queued since the last drain started
+        self._drain_pending = False # a drain is queued or running
+        self._drain_failures = 0    # consecutive failed drains, for backoff
+        self._next_drain = 0.0      # monotonic time before which no drain is started
+        
+        # Pre-serialized '{"device_id":"...",' so telemetry bodies are built by
+        # byte concatenation instead of re-encoding the constant field each time
+        self._telemetry_prefix = orjson.dumps({'device_id': self.device_id})[:-1] + b','
+        
+        # Hot endpoints resolved once, so per-tick calls skip URL merging
+        self._telemetry_url = httpx.URL(f"{self.base_url}/telemetry")
+        self._telemetry_batch_url = httpx.URL(f"{self.base_url}/telemetry/batch")
+        self._commands_url = httpx.URL(f"{self.base_url}/commands")
+        self._commands_prefix = f"{self.base_url}/commands/"
+        self._commands_ack_url = httpx.URL(f"{self.base_url}/commands/ack")
+        self._commands_params = {'device_id': self.device_id}
+        
+        # Deferred command acknowledgements, sent together by flush_acks()
+        self._pending_acks = []
+        self._acks_lock = threading.RLock()  # reentrant for the same reason
+        self._ack_failures = 0      # consecutive failed flushes, for backoff
+        self._next_ack_flush = 0.0  # monotonic time before which retries wait
+        
+        # Set by close() to end poll_commands_stream() and stop retries
+        self._closed = threading.Event()
+        
+        # Flush buffered telemetry and close the pool even if the caller
+        # exits without calling close()
+        atexit.register(self.close)
         
         # Track API health
         self.last_successful_request = None
         self.consecutive_failures = 0
+        self._connected = False
+        
+        logger.info("APIClient initialized: %s (device %s)", self.base_url, self.device_id)
         
-        print(f"APIClient initialized: {self.base_url}")
-        print(f"Device ID: {self.device_id}")
+        # Resume delivery of anything left over from a previous run
+        pending = len(self._telemetry_queue)
+        if pending:
+            logger.info("Resuming upload of %d buffered telemetry sample(s)", pending)
+            self.flush()
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
+    def _record_success(self):
+        """Update health tracking after a successful request"""
+        self.last_successful_request = time.time()
+        self.consecutive_failures = 0
+        self._connected = True
+    
+    def _make_request(self, method: str, endpoint, **kwargs) -> Optional[httpx.Response]:
         """
         Make HTTP request with retry logic
         
         Args:
             method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint (without base URL)
-            **kwargs: Additional arguments for requests
+            endpoint: API endpoint (relative to base URL) or absolute URL
+            **kwargs: Additional arguments for httpx
+            
+        Returns:
+            Response object or None if failed
+        """
+        return self._send_with_retry(partial(self.client.request, method, endpoint, **kwargs), endpoint)
+    
+    def _post_json(self, url: httpx.URL, body: bytes) -> Optional[httpx.Response]:
+        """
+        POST a pre-encoded gzip JSON body with retry logic
+        
+        Goes straight to client.post with the precompiled URL, skipping
+        the generic request() argument handling.
+        
+        Args:
+            url: Precompiled absolute endpoint URL
+            body: Body from _encode_json/_encode_telemetry
+            
+        Returns:
+            Response object or None if failed
+        """
+        return self._send_with_retry(
+            partial(self.client.post, url, content=body, headers=GZIP_JSON_HEADERS), url
+        )
+    
+    def _send_with_retry(self, send: Callable[[], httpx.Response], endpoint) -> Optional[httpx.Response]:
+        """
+        Call send() up to API_MAX_RETRIES times
+        
+        Connect failures are already retried by the transport, so only
+        timeouts, 5xx and 429 responses are retried here, waiting for
+        Retry-After or a jittered backoff between attempts. Once close() has
+        been called, no further attempts are made.
+        
+        Args:
+            send: Issues the request once
+            endpoint: Endpoint for log messages
             
         Returns:
             Response object or None if failed
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        prev_delay = CFG.API_RETRY_DELAY
         
-        for attempt in range(API_MAX_RETRIES):
+        for attempt in range(CFG.API_MAX_RETRIES):
+            retry_after = None
+            
             try:
-                if DEBUG_MODE:
-                    print(f"API {method} {url} (attempt {attempt + 1}/{API_MAX_RETRIES})")
+                logger.debug("API %s (attempt %d/%d)", endpoint, attempt + 1, CFG.API_MAX_RETRIES)
                 
-                response = self.session.request(
-                    method,
-                    url,
-                    timeout=API_REQUEST_TIMEOUT,
-                    **kwargs
-                )
+                response = send()
                 
                 # Check if successful
-                if response.status_code < 500:
-                    self.last_successful_request = time.time()
-                    self.consecutive_failures = 0
+                if response.status_code < 500 and response.status_code != 429:
+                    self._record_success()
                     return response
                 
-                # Server error - retry
-                print(f"Server error {response.status_code}: {response.text}")
+                # Server error or rate limited - retry
+                logger.warning("Server error %d: %s", response.status_code, response.text)
+                if response.status_code in (429, 503):
+                    retry_after = self._parse_retry_after(response)
                 
-            except requests.exceptions.Timeout:
-                print(f"Request timeout (attempt {attempt + 1})")
-            except requests.exceptions.ConnectionError:
-                print(f"Connection error (attempt {attempt + 1})")
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                logger.warning("Connection error after %d transport retries", CFG.API_MAX_RETRIES)
+                break
+            except httpx.TimeoutException:
+                logger.warning("Request timeout (attempt %d)", attempt + 1)
+            except httpx.TransportError:
+                logger.warning("Transport error (attempt %d)", attempt + 1)
             except Exception as e:
-                print(f"Request error: {e}")
+                logger.error("Request error: %s", e)
             
-            # Wait before retry (exponential backoff)
-            if attempt < API_MAX_RETRIES - 1:
-                delay = API_RETRY_DELAY * (2 ** attempt)
-                print(f"Retrying in {delay}s...")
-                time.sleep(delay)
+            # Wait before retry (decorrelated jitter so devices don't retry in lockstep)
+            if attempt < CFG.API_MAX_RETRIES - 1:
+                if retry_after is not None:
+                    delay = min(CFG.API_RETRY_MAX_DELAY, retry_after)
+                else:
+                    prev_delay = min(CFG.API_RETRY_MAX_DELAY, random.uniform(CFG.API_RETRY_DELAY, prev_delay * 3.0))
+                    delay = prev_delay
+                logger.info("Retrying in %.1fs...", delay)
+                if self._closed.wait(delay):
+                    break
         
         # All retries failed
         self.consecutive_failures += 1
-        print(f"Request failed after {API_MAX_RETRIES} attempts")
+        if self.consecutive_failures >= CFG.API_DISCONNECT_THRESHOLD:
+            self._connected = False
+        logger.error("Request to %s failed", endpoint)
         return None
     
+    @staticmethod
+    def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+        """
+        Parse the Retry-After header (delta-seconds form only)
+        
+        Returns:
+            Seconds to wait, or None if absent or not a number
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _encode_json(payload: Dict) -> bytes:
+        """
+        Serialize payload as gzip-compressed JSON
+        
+        Level 1 roughly halves small JSON bodies at negligible CPU cost.
+        """
+        return gzip.compress(orjson.dumps(payload), compresslevel=1)
+    
+    def _encode_telemetry(self, fields: bytes) -> bytes:
+        """
+        Build a gzip-compressed telemetry body from the cached device prefix
+        
+        Args:
+            fields: Serialized JSON object members without braces
+            
+        Returns:
+            Compressed '{"device_id": ..., <fields>}' body
+        """
+        return gzip.compress(self._telemetry_prefix + fields + b'}', compresslevel=1)
+    
     def send_telemetry(self, sensor_data: Dict) -> bool:
         """
         Send sensor telemetry to backend
@@ -109,33 +266,169 @@ class APIClient:
         Returns:
             True if successful
         """
-        payload = {
-            'device_id': self.device_id,
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+        sample = orjson.dumps(self._build_telemetry_sample(sensor_data))
+        
+        response = self._post_json(self._telemetry_url, self._encode_telemetry(sample[1:-1]))
+        
+        if response and response.status_code == 201:
+            logger.debug("Telemetry sent successfully: %s", response.text)
+            return True
+        
+        if response:
+            logger.warning("Telemetry failed: %d - %s", response.status_code, response.text)
+        
+        return False
+    
+    def enqueue_telemetry(self, sensor_data: Dict):
+        """
+        Queue sensor telemetry for background delivery
+        
+        Returns immediately. Samples are accumulated and sent in a single
+        batch request once TELEMETRY_BATCH_SIZE new samples are queued or the
+        oldest one is TELEMETRY_BATCH_MAX_AGE seconds old. After a failed
+        upload, new drains are held back with exponential backoff; samples
+        keep accumulating in the buffer meanwhile.
+        
+        Args:
+            sensor_data: Dictionary with sensor readings
+        """
+        now = time.monotonic()
+        
+        with self._telemetry_lock:
+            self._telemetry_queue.append(self._build_telemetry_sample(sensor_data))
+            self._batch_count += 1
+            if self._batch_started is None:
+                self._batch_started = now
+        
+        self.maybe_flush(now)
+    
+    def maybe_flush(self, now: float):
+        """
+        Start a drain if the current batch is full or old enough
+        
+        Called on every sample, and by the caller on ticks where no sample is
+        queued, so a partial batch still goes out after TELEMETRY_BATCH_MAX_AGE.
+        
+        Args:
+            now: Current monotonic time
+        """
+        with self._telemetry_lock:
+            ready = (self._batch_started is not None
+                     and not self._drain_pending and now >= self._next_drain
+                     and (self._batch_count >= CFG.TELEMETRY_BATCH_SIZE
+                          or now - self._batch_started >= CFG.TELEMETRY_BATCH_MAX_AGE))
+        
+        if ready:
+            self.flush()
+    
+    def flush(self):
+        """Send all queued telemetry in the background, regardless of batch size or backoff"""
+        with self._telemetry_lock:
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        self._executor.submit(self._drain_telemetry)
+    
+    def _build_telemetry_sample(self, sensor_data: Dict) -> Dict:
+        """
+        Build a single telemetry sample, timestamped now
+        
+        Args:
+            sensor_data: Dictionary with sensor readings
+            
+        Returns:
+            Sample dictionary (without device_id)
+        """
+        return {
+            'timestamp': _ts_ms(),
             'soil_pct': sensor_data.get('soil_pct'),
             'temperature_c': sensor_data.get('temperature_c'),
             'humidity_pct': sensor_data.get('humidity_pct'),
             'lux': sensor_data.get('lux')
         }
+    
+    def _drain_telemetry(self, timeout: float = -1):
+        """
+        Send all buffered telemetry samples (runs on the executor)
+        
+        Args:
+            timeout: Seconds to wait for a drain already in progress before
+                giving up (-1 waits indefinitely)
+        """
+        if not self._drain_lock.acquire(timeout=timeout):
+            logger.warning("Telemetry upload still in progress; leaving samples buffered")
+            return
+        ok = True
+        try:
+            with self._telemetry_lock:
+                self._batch_started = None
+                self._batch_count = 0
+            
+            while True:
+                # Rows stay in the buffer until the backend has accepted them
+                last_id, payloads = self._telemetry_queue.peek(CFG.TELEMETRY_UPLOAD_LIMIT)
+                if not payloads:
+                    return
+                
+                if not self._send_samples_json(b'[' + b','.join(payloads) + b']', len(payloads)):
+                    ok = False
+                    return
+                
+                self._telemetry_queue.remove_through(last_id)
+                if len(payloads) < CFG.TELEMETRY_UPLOAD_LIMIT:
+                    return
+        finally:
+            self._drain_lock.release()
+            now = time.monotonic()
+            with self._telemetry_lock:
+                self._drain_pending = False
+                if ok:
+                    self._drain_failures = 0
+                    self._next_drain = 0.0
+                else:
+                    # Keep the samples for a later drain, backing off while
+                    # the backend stays unreachable
+                    self._drain_failures += 1
+                    delay = min(CFG.API_RETRY_MAX_DELAY * 5,
+                                CFG.TELEMETRY_INTERVAL * 2 ** self._drain_failures)
+                    self._next_drain = now + delay
+                    if self._batch_started is None:
+                        self._batch_started = now
+    
+    def send_telemetry_batch(self, samples: List[Dict]) -> bool:
+        """
+        Send several telemetry samples in one request
         
-        response = self._make_request('POST', '/telemetry', json=payload)
+        Args:
+            samples: Samples built by _build_telemetry_sample
+            
+        Returns:
+            True if successful
+        """
+        return self._send_samples_json(orjson.dumps(samples), len(samples))
+    
+    def _send_samples_json(self, samples_json: bytes, count: int) -> bool:
+        """POST an already-encoded JSON array of samples to /telemetry/batch"""
+        response = self._post_json(
+            self._telemetry_batch_url,
+            self._encode_telemetry(b'"samples":' + samples_json)
+        )
         
         if response and response.status_code == 201:
-            if DEBUG_MODE:
-                print(f"Telemetry sent successfully: {response.json()}")
+            logger.debug("Telemetry batch sent: %d sample(s)", count)
             return True
         
         if response:
-            print(f"Telemetry failed: {response.status_code} - {response.text}")
+            logger.warning("Telemetry batch failed: %d - %s", response.status_code, response.text)
         
         return False
     
-    def upload_image(self, image_bytes: bytes, wait_for_ai: bool = True, max_wait: int = 60) -> Optional[Dict]:
+    def upload_image(self, image: BinaryIO, wait_for_ai: bool = True, max_wait: int = 60) -> Optional[Dict]:
         """
         Upload plant image to backend for AI analysis
         
         Args:
-            image_bytes: Image data (JPEG format)
+            image: Image stream (JPEG format), streamed into the request body
             wait_for_ai: Whether to wait for AI processing to complete
             max_wait: Maximum seconds to wait for AI processing
             
@@ -143,15 +436,15 @@ class APIClient:
             Response data with detections and plant info, or None if failed
         """
         files = {
-            'image': ('plant.jpg', BytesIO(image_bytes), 'image/jpeg')
+            'image': ('plant.jpg', image, 'image/jpeg')
         }
         
         data = {
             'device_id': self.device_id,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _ts_ms()
         }
         
-        # Session already has Authorization header, so don't pass it again
+        # Client already has Authorization header, so don't pass it again
         response = self._make_request(
             'POST',
             '/image',
@@ -162,17 +455,16 @@ class APIClient:
         if not response or response.status_code != 201:
             if response:
                 try:
-                    error_data = response.json()
-                    print(f"Image upload failed: {response.status_code} - {error_data}")
-                except:
-                    print(f"Image upload failed: {response.status_code} - {response.text}")
+                    error_data = orjson.loads(response.content)
+                    logger.warning("Image upload failed: %d - %s", response.status_code, error_data)
+                except ValueError:
+                    logger.warning("Image upload failed: %d - %s", response.status_code, response.text)
             return None
         
-        result = response.json()
+        result = orjson.loads(response.content)
         data = result.get('data')
         
-        if DEBUG_MODE:
-            print(f"Image uploaded successfully: {result}")
+        logger.debug("Image uploaded successfully: %s", result)
         
         # If not waiting for AI or AI already processed, return immediately
         if not wait_for_ai or not data.get('processing'):
@@ -181,10 +473,10 @@ class APIClient:
         # Poll for AI results
         image_id = data.get('image', {}).get('id')
         if not image_id:
-            print("No image ID in response, cannot poll for AI results")
+            logger.warning("No image ID in response, cannot poll for AI results")
             return data
         
-        print(f"AI processing in background, polling for results (max {max_wait}s)...")
+        logger.info("AI processing in background, polling for results (max %ds)...", max_wait)
         start_time = time.time()
         poll_interval = 5  # seconds between polls
         
@@ -194,13 +486,13 @@ class APIClient:
             # Check AI status
             ai_data = self.get_image_details(image_id)
             if ai_data and not ai_data.get('processing'):
-                print(f"✓ AI processing complete ({len(ai_data.get('detections', []))} detection(s))")
+                logger.info("AI processing complete (%d detection(s))", len(ai_data.get('detections', [])))
                 return ai_data
             
             elapsed = int(time.time() - start_time)
-            print(f"  Still processing... ({elapsed}s elapsed)")
+            logger.info("Still processing... (%ds elapsed)", elapsed)
         
-        print(f"⚠ AI processing timeout after {max_wait}s, returning partial data")
+        logger.warning("AI processing timeout after %ds, returning partial data", max_wait)
         return data
     
     def get_image_details(self, image_id: int) -> Optional[Dict]:
@@ -216,7 +508,7 @@ class APIClient:
         response = self._make_request('GET', f'/image/{image_id}')
         
         if response and response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             return result.get('data')
         
         return None
@@ -228,25 +520,56 @@ class APIClient:
         Returns:
             List of pending command dictionaries
         """
-        params = {'device_id': self.device_id}
-        
-        response = self._make_request('GET', '/commands', params=params)
+        response = self._make_request('GET', self._commands_url, params=self._commands_params)
         
         if response and response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             commands = result.get('data', {}).get('commands', [])
             
-            if commands and DEBUG_MODE:
-                print(f"Received {len(commands)} pending command(s)")
+            if commands:
+                logger.debug("Received %d pending command(s)", len(commands))
             
             return commands
         
         if response and response.status_code != 200:
-            print(f"Command poll failed: {response.status_code}")
+            logger.warning("Command poll failed: %d", response.status_code)
         
         return []
     
-    def acknowledge_command(self, command_id: str, status: str, result: Optional[Dict] = None) -> bool:
+    def poll_commands_stream(self, wait: int = CFG.COMMAND_LONG_POLL_WAIT) -> Iterator[Dict]:
+        """
+        Yield commands as they arrive, using long-polling
+        
+        The backend holds each GET /commands?wait=N open until a command is
+        queued or N seconds pass, so an idle device makes one request per N
+        seconds instead of one per COMMAND_POLL_INTERVAL. Runs until close().
+        
+        Args:
+            wait: Seconds the backend may hold each request open
+            
+        Yields:
+            Pending command dictionaries
+        """
+        params = {**self._commands_params, 'wait': wait}
+        timeout = httpx.Timeout(CFG.API_REQUEST_TIMEOUT, read=wait + CFG.API_REQUEST_TIMEOUT)
+        
+        while not self._closed.is_set():
+            response = self._make_request('GET', self._commands_url, params=params, timeout=timeout)
+            
+            if response is None or response.status_code != 200:
+                if response is not None:
+                    logger.warning("Command long-poll failed: %d", response.status_code)
+                # Back off before reconnecting (returns early on close)
+                self._closed.wait(CFG.COMMAND_POLL_INTERVAL)
+                continue
+            
+            commands = orjson.loads(response.content).get('data', {}).get('commands', [])
+            if commands:
+                logger.debug("Received %d pending command(s)", len(commands))
+            yield from commands
+    
+    def acknowledge_command(self, command_id: str, status: str, result: Optional[Dict] = None,
+                            defer: bool = False) -> bool:
         """
         Acknowledge command execution
         
@@ -254,30 +577,77 @@ class APIClient:
             command_id: Command ID
             status: Command status ('started', 'completed', 'failed')
             result: Optional result data
+            defer: Queue the acknowledgement for the next flush_acks() instead
+                of sending it now
             
         Returns:
-            True if successful
+            True if successful (always True when deferred)
         """
         payload = {
             'status': status,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _ts_ms()
         }
         
         if result:
             payload['result'] = result
         
-        response = self._make_request('POST', f'/commands/{command_id}', json=payload)
+        if defer:
+            payload['id'] = command_id
+            with self._acks_lock:
+                self._pending_acks.append(payload)
+            return True
+        
+        response = self._post_json(
+            httpx.URL(self._commands_prefix + str(command_id)),
+            self._encode_json(payload)
+        )
         
         if response and response.status_code == 200:
-            if DEBUG_MODE:
-                print(f"Command {command_id} acknowledged as {status}")
+            logger.debug("Command %s acknowledged as %s", command_id, status)
             return True
         
         if response:
-            print(f"Command acknowledgment failed: {response.status_code}")
+            logger.warning("Command acknowledgment failed: %d", response.status_code)
         
         return False
     
+    def flush_acks(self, force: bool = True) -> bool:
+        """
+        Send all deferred command acknowledgements in one request
+        
+        Acknowledgements that could not be delivered are kept for the next
+        call, and non-forced calls back off exponentially until one succeeds.
+        
+        Args:
+            force: Send now even while backing off after a failure
+            
+        Returns:
+            True if nothing is left pending
+        """
+        with self._acks_lock:
+            if not self._pending_acks:
+                return True
+            if not force and time.monotonic() < self._next_ack_flush:
+                return False
+            acks, self._pending_acks = self._pending_acks, []
+        
+        response = self._post_json(self._commands_ack_url, self._encode_json({'acks': acks}))
+        
+        if response and response.status_code == 200:
+            logger.debug("Acknowledged %d command(s)", len(acks))
+            with self._acks_lock:
+                self._ack_failures = 0
+            return True
+        
+        if response:
+            logger.warning("Batch command acknowledgment failed: %d", response.status_code)
+        with self._acks_lock:
+            self._pending_acks[:0] = acks
+            self._ack_failures += 1
+            self._next_ack_flush = time.monotonic() + min(
+                CFG.API_RETRY_MAX_DELAY, CFG.API_RETRY_DELAY * 2 ** self._ack_failures)
+        return False
+    
     def get_command_status(self, command_id: str) -> Optional[Dict]:
         """
         Get command status by ID
@@ -291,7 +661,7 @@ class APIClient:
         response = self._make_request('GET', f'/commands/{command_id}')
         
         if response and response.status_code == 200:
-            return response.json().get('data')
+            return orjson.loads(response.content).get('data')
         
         return None
     
@@ -299,15 +669,38 @@ class APIClient:
         """
         Check if connected to backend
         
+        The flag is maintained by the request paths, so this is a plain
+        attribute read with no clock access.
+        
         Returns:
-            True if recently successful request
+            True if a request has succeeded and fewer than
+            API_DISCONNECT_THRESHOLD requests have failed since
         """
-        if self.last_successful_request is None:
-            return False
-        
-        # Consider connected if successful request in last 5 minutes
-        time_since_success = time.time() - self.last_successful_request
-        return time_since_success < 300
+        return self._connected
+    
+    def close(self):
+        """Send pending acks and queued telemetry, then close the connection pool and buffer"""
+        if self._closed.is_set():
+            return
+        # Stops retries, including those of a drain already running
+        self._closed.set()
+        try:
+            # One short attempt each; telemetry that doesn't get through stays
+            # in the SQLite buffer for the next start instead of holding up
+            # shutdown
+            self.client.timeout = httpx.Timeout(CFG.API_SHUTDOWN_TIMEOUT)
+            self.flush_acks()
+            # Give a running drain up to one request to finish, then send the
+            # rest on this thread: from atexit the executor no longer accepts
+            # new work. Not joined outright, as a signal handler may have
+            # interrupted this thread while it held a lock the worker needs.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._drain_telemetry(timeout=CFG.API_REQUEST_TIMEOUT)
+        finally:
+            try:
+                self.client.close()
+            finally:
+                self._telemetry_queue.close()
     
     def get_health(self) -> Dict:
         """
@@ -327,14 +720,14 @@ class APIClient:
 
 # Test the API client
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if CFG.DEBUG_MODE else logging.INFO)
     print("Testing API client...")
     
     # Use test configuration
     import sys
-    if len(sys.argv) > 1:
-        API_BASE_URL = sys.argv[1]
+    base_url = sys.argv[1] if len(sys.argv) > 1 else None
     
-    client = APIClient()
+    client = APIClient(base_url)
     
     print("\nHealth check:")
     print(client.get_health())
@@ -355,4 +748,5 @@ if __name__ == "__main__":
     for cmd in commands:
         print(f"  - {cmd.get('type')}: {cmd.get('payload')}")
     
+    client.close()
     print("\nTest complete!")
\ No newline at end of file
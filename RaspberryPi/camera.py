@@ -4,24 +4,26 @@ Handles capturing images from Pi Camera (using picamera2)
 """
 
 import io
+import importlib.util
+import logging
 import time
-from typing import Optional
-from PIL import Image
+from typing import BinaryIO, Optional
 
-try:
-    from picamera2 import Picamera2
-    PICAMERA2_AVAILABLE = True
-except ImportError:
-    PICAMERA2_AVAILABLE = False
-    print("Warning: picamera2 not available. Using mock camera.")
+from config import CFG
 
-from config import *
+logger = logging.getLogger(__name__)
+
+# Only probe for picamera2 here; the module itself is imported when a real
+# camera is opened. PIL is likewise only imported by the mock path.
+PICAMERA2_AVAILABLE = importlib.util.find_spec('picamera2') is not None
+if not PICAMERA2_AVAILABLE:
+    logger.warning("picamera2 not available. Using mock camera.")
 
 
 class CameraHandler:
     """Handles capturing images from Raspberry Pi Camera"""
     
-    def __init__(self, use_mock: bool = USE_MOCK_CAMERA):
+    def __init__(self, use_mock: bool = CFG.USE_MOCK_CAMERA):
         """
         Initialize camera handler
         
@@ -31,72 +33,77 @@ class CameraHandler:
         self.use_mock = use_mock or not PICAMERA2_AVAILABLE
         self.camera = None
         
-        if not self.use_mock and ENABLE_CAMERA:
+        if not self.use_mock and CFG.ENABLE_CAMERA:
             try:
+                from picamera2 import Picamera2
                 self.camera = Picamera2()
                 
                 # Configure camera
                 config = self.camera.create_still_configuration(
-                    main={"size": CAMERA_RESOLUTION}
+                    main={"size": CFG.IMAGE_UPLOAD_RESOLUTION}
                 )
                 self.camera.configure(config)
                 
+                # JPEG quality used by picamera2's libjpeg-turbo encoder
+                self.camera.options["quality"] = CFG.IMAGE_QUALITY
+                
                 # Start camera
                 self.camera.start()
                 
                 # Allow camera to warm up
                 time.sleep(2)
-                print(f"Camera initialized: {CAMERA_RESOLUTION[0]}x{CAMERA_RESOLUTION[1]}")
+                logger.info("Camera initialized: %dx%d", *CFG.IMAGE_UPLOAD_RESOLUTION)
             except Exception as e:
-                print(f"Error initializing camera: {e}")
+                logger.error("Error initializing camera: %s", e)
                 self.use_mock = True
         
-        print(f"CameraHandler initialized (mock={'ON' if self.use_mock else 'OFF'})")
+        logger.info("CameraHandler initialized (mock=%s)", 'ON' if self.use_mock else 'OFF')
     
-    def capture_image(self) -> Optional[bytes]:
+    def capture_image(self) -> Optional[BinaryIO]:
         """
         Capture image from camera
         
+        The JPEG is returned as an in-memory stream (positioned at 0) so it
+        can be handed to the HTTP client without another copy.
+        
         Returns:
-            Image bytes (JPEG format) or None if error
+            Image stream (JPEG format) or None if error
         """
-        if not ENABLE_CAMERA:
-            print("Camera disabled in config")
+        if not CFG.ENABLE_CAMERA:
+            logger.info("Camera disabled in config")
             return None
         
         if self.use_mock:
             return self._generate_mock_image()
         
         try:
-            # Capture image as PIL Image
-            image = self.camera.capture_image("main")
-            
-            # Convert to bytes
+            # Encode straight to JPEG in picamera2 (libjpeg-turbo), skipping
+            # the PIL image round-trip
             stream = io.BytesIO()
-            image.save(stream, format='JPEG', quality=IMAGE_QUALITY)
+            self.camera.capture_file(stream, format='jpeg')
             stream.seek(0)
-            image_bytes = stream.read()
             
-            print(f"Image captured: {len(image_bytes)} bytes")
-            return image_bytes
+            logger.debug("Image captured: %d bytes", stream.getbuffer().nbytes)
+            return stream
             
         except Exception as e:
-            print(f"Error capturing image: {e}")
+            logger.error("Error capturing image: %s", e)
             return None
     
-    def _generate_mock_image(self) -> bytes:
+    def _generate_mock_image(self) -> BinaryIO:
         """
         Generate a mock image for testing
         
         Returns:
-            Mock image bytes (JPEG format)
+            Mock image stream (JPEG format)
         """
         try:
+            from PIL import Image, ImageDraw
+            
             # Create a simple colored image
-            img = Image.new('RGB', CAMERA_RESOLUTION, color=(34, 139, 34))  # Forest green
+            img = Image.new('RGB', CFG.IMAGE_UPLOAD_RESOLUTION, color=(34, 139, 34))  # Forest green
             
             # Add some text to make it identifiable
-            from PIL import ImageDraw, ImageFont
             draw = ImageDraw.Draw(img)
             text = f"Mock Image\n{time.strftime('%Y-%m-%d %H:%M:%S')}"
             
@@ -105,15 +112,15 @@ class CameraHandler:
             
             # Convert to bytes
             stream = io.BytesIO()
-            img.save(stream, format='JPEG', quality=IMAGE_QUALITY)
+            img.save(stream, format='JPEG', quality=CFG.IMAGE_QUALITY)
             stream.seek(0)
             
-            return stream.read()
+            return stream
             
         except Exception as e:
-            print(f"Error generating mock image: {e}")
+            logger.error("Error generating mock image: %s", e)
             # Return minimal valid JPEG if PIL fails
-            return b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9'
+            return io.BytesIO(b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\xff\xd9')
     
     def capture_and_save(self, filename: str) -> bool:
         """
@@ -126,15 +133,15 @@ class CameraHandler:
             True if successful
         """
         try:
-            image_bytes = self.capture_image()
-            if image_bytes:
+            image = self.capture_image()
+            if image:
                 with open(filename, 'wb') as f:
-                    f.write(image_bytes)
-                print(f"Image saved to {filename}")
+                    f.write(image.getbuffer())
+                logger.info("Image saved to %s", filename)
                 return True
             return False
         except Exception as e:
-            print(f"Error saving image: {e}")
+            logger.error("Error saving image: %s", e)
             return False
     
     def cleanup(self):
@@ -143,22 +150,23 @@ class CameraHandler:
             try:
                 self.camera.stop()
                 self.camera.close()
-                print("Camera closed")
+                logger.info("Camera closed")
             except Exception as e:
-                print(f"Error closing camera: {e}")
+                logger.error("Error closing camera: %s", e)
 
 
 # Test the camera handler
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if CFG.DEBUG_MODE else logging.INFO)
     print("Testing camera handler...")
     camera = CameraHandler(use_mock=False)  # Set to False to test real camera
     
     print("\nCapturing test images...")
     for i in range(3):
         print(f"\nCapture {i+1}:")
-        image_bytes = camera.capture_image()
-        if image_bytes:
-            print(f"  Successfully captured {len(image_bytes)} bytes")
+        image = camera.capture_image()
+        if image:
+            print(f"  Successfully captured {image.getbuffer().nbytes} bytes")
             # Save test image
             filename = f"test_image_{i+1}.jpg"
             camera.capture_and_save(filename)
@@ -1,9 +1,20 @@
 """
 Configuration file for Raspberry Pi Plant Monitoring System
 Copy this to config_local.py and update with your actual values
+
+All settings are also frozen into a single immutable CFG object
+(after local overrides are applied); import it with `from config import CFG`.
 """
 
 import os
+from dataclasses import make_dataclass
+
+# ============================================
+# Hardware Profile
+# ============================================
+# "analog" = real sensors via MCP3008 ADC, Pi camera and pump relay
+# "mock"   = no hardware attached (mock sensors and camera, pump disabled)
+HARDWARE_PROFILE = os.getenv("HARDWARE_PROFILE", "analog")
 
 # ============================================
 # API Configuration
@@ -17,6 +28,9 @@ DEVICE_TOKEN = os.getenv("DEVICE_TOKEN", "/gYSguYys3l5YxurQV8GwTIYmjndII8DAXyzWX
 # Unique identifier for this Raspberry Pi device
 DEVICE_ID = os.getenv("DEVICE_ID", "raspberry-pi-001")
 
+# GPIO character device used by lgpio (/dev/gpiochip<N>)
+GPIO_CHIP = 0
+
 # ============================================
 # Sensor Configuration (Analog via MCP3008)
 # ============================================
@@ -29,9 +43,18 @@ ENABLE_LIGHT_SENSOR = True
 # DHT22 Temperature/Humidity Sensor (Digital)
 DHT_PIN = 17                  # GPIO pin for DHT22 sensor
 DHT_SENSOR_TYPE = 22          # 22 for DHT22, 11 for DHT11
+DHT_MIN_INTERVAL = 2.0        # Seconds between DHT22 conversions (sensor limit)
+DHT_MAX_AGE = 10              # Discard DHT22 readings older than this (seconds)
+DHT_SAMPLE_INTERVAL = 30      # Background DHT sampling period (seconds)
 
 # ADC Configuration (MCP3008)
 ADC_ENABLED = True            # Enable MCP3008 ADC
+ADC_SPI_BUS = 0               # Hardware SPI bus (/dev/spidev<bus>.<device>)
+ADC_SPI_DEVICE = 0            # Chip select: 0 = CE0
+ADC_SPI_SPEED_HZ = 1_000_000  # SPI clock (MCP3008 max is 1.35 MHz at 3.3 V)
+ADC_SAMPLES = 1               # Conversions per reading; >1 takes the median to reject one-off glitches
+
+# Bit-banged SPI pins, only used when hardware SPI is not enabled
 ADC_CLK_PIN = 11              # GPIO 11 (SCLK) - Pin 23
 ADC_MISO_PIN = 9              # GPIO 9 (MISO) - Pin 21
 ADC_MOSI_PIN = 10             # GPIO 10 (MOSI) - Pin 19
@@ -62,11 +85,15 @@ TEMPERATURE_HUMIDITY_PIN = DHT_PIN
 # Camera Configuration
 # ============================================
 ENABLE_CAMERA = True
-CAMERA_RESOLUTION = (1024, 768)  # (width, height)
+# Size images are captured at for upload (width, height). The camera ISP
+# scales to this in hardware; 640x480 is ~4x fewer bytes than 1024x768 and
+# matches the backend model's input size.
+IMAGE_UPLOAD_RESOLUTION = (640, 480)
 CAMERA_ROTATION = 0              # 0, 90, 180, or 270 degrees
 
-# Image quality (1-100, higher = better quality but larger file)
-IMAGE_QUALITY = 85
+# Image quality (1-100, higher = better quality but larger file).
+# 75 is about half the bytes of 85 with no visible loss at the model's input size.
+IMAGE_QUALITY = 75
 
 # ============================================
 # Water Pump Configuration
@@ -83,12 +110,37 @@ PUMP_MIN_INTERVAL = 300          # Minimum seconds between pump activations
 # How often to read sensors and send telemetry (seconds)
 TELEMETRY_INTERVAL = 15
 
+# Unchanged readings are not re-sent, except at least this often (seconds)
+TELEMETRY_HEARTBEAT_INTERVAL = 300
+
 # How often to capture and upload images (seconds)
 IMAGE_CAPTURE_INTERVAL = 300  # 5 minutes
 
-# How often to poll for commands (seconds)
+# Commands arrive over a long-poll; this is the retry delay after a
+# failed poll (seconds)
 COMMAND_POLL_INTERVAL = 10
 
+# How often to print the system status summary (seconds)
+STATUS_DISPLAY_INTERVAL = 60
+
+# How long the backend holds a long-poll command request open (seconds, max 25)
+COMMAND_LONG_POLL_WAIT = 25
+
+# Maximum telemetry samples buffered while the backend is unreachable
+# (oldest samples are dropped first; 500 x 15 s is about two hours)
+TELEMETRY_QUEUE_SIZE = 500
+
+# SQLite file holding unsent telemetry across restarts (':memory:' to disable)
+TELEMETRY_BUFFER_DB = "telemetry_buffer.db"
+
+# Maximum samples per /telemetry/batch request when draining a backlog
+TELEMETRY_UPLOAD_LIMIT = 200
+
+# Telemetry samples are sent in batches of this many readings...
+TELEMETRY_BATCH_SIZE = 4
+# ...or once the oldest queued reading is this old (seconds)
+TELEMETRY_BATCH_MAX_AGE = 60
+
 # ============================================
 # Automatic Watering Configuration
 # ============================================
@@ -123,6 +175,9 @@ LOG_BACKUP_COUNT = 5
 API_REQUEST_TIMEOUT = 30    # Timeout for API requests (seconds)
 API_MAX_RETRIES = 3         # Number of retries for failed API calls
 API_RETRY_DELAY = 5         # Initial delay between retries (seconds)
+API_RETRY_MAX_DELAY = 60    # Upper bound for jittered retry delay (seconds)
+API_DISCONNECT_THRESHOLD = 3  # Consecutive failed requests before reporting disconnected
+API_SHUTDOWN_TIMEOUT = 5    # Timeout for the final, unretried flush on shutdown (seconds)
 
 # ============================================
 # Safety Configuration
@@ -154,3 +209,34 @@ try:
     print("✓ Loaded config_local.py overrides")
 except ImportError:
     pass  # No local config file, use defaults above
+
+# Pre-rename name for the capture size; honoured if config_local still sets it
+if 'CAMERA_RESOLUTION' in globals():
+    IMAGE_UPLOAD_RESOLUTION = CAMERA_RESOLUTION
+
+# Applied after the local overrides so HARDWARE_PROFILE can be set either
+# in the environment or in config_local.py
+if HARDWARE_PROFILE == "mock":
+    USE_MOCK_SENSORS = True
+    USE_MOCK_CAMERA = True
+    ENABLE_PUMP = False
+elif HARDWARE_PROFILE != "analog":
+    raise ValueError(f"Unknown HARDWARE_PROFILE: {HARDWARE_PROFILE!r} (expected 'analog' or 'mock')")
+
+
+# ============================================
+# Frozen Configuration Object
+# ============================================
+def _build_config():
+    """Freeze every UPPER_CASE setting above into one immutable, slotted object"""
+    settings = {name: value for name, value in globals().items() if name.isupper()}
+    config_cls = make_dataclass(
+        'Config',
+        [(name, type(value)) for name, value in settings.items()],
+        frozen=True,
+        slots=True
+    )
+    return config_cls, config_cls(**settings)
+
+
+Config, CFG = _build_config()
@@ -29,7 +29,12 @@ sudo apt-get install -y \
     python3-setuptools \
     python3-venv \
     build-essential \
-    libgpiod2
+    libgpiod2 \
+    pigpio
+
+# Start the pigpio daemon (edge-timed DHT22 reads)
+echo "Enabling pigpiod..."
+sudo systemctl enable --now pigpiod
 
 # Install camera support
 echo "Installing camera support..."
@@ -84,7 +89,7 @@ Type=simple
 User=$USER
 WorkingDirectory=$(pwd)
 Environment="PATH=$(pwd)/venv/bin"
-ExecStart=$(pwd)/venv/bin/python main.py
+ExecStart=$(pwd)/venv/bin/python -O main.py
 Restart=always
 RestartSec=10
 
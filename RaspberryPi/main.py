@@ -10,30 +10,37 @@ This is the main entry point that coordinates all components:
 
 import time
 import sys
+import heapq
 import signal
-import json
-from datetime import datetime
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
 from typing import Optional, Dict
 
-from config import *
+from config import CFG
 from sensors import SensorReader
 from camera import CameraHandler
 from pump import PumpController
 from api_client import APIClient
 
+logger = logging.getLogger(__name__)
+
 
 class PlantMonitor:
     """Main application class for plant monitoring system"""
     
     def __init__(self):
         """Initialize plant monitoring system"""
-        print("=" * 60)
-        print("Smart Plant Monitoring System - Raspberry Pi")
-        print("=" * 60)
-        print(f"Device ID: {DEVICE_ID}")
-        print(f"API URL: {API_BASE_URL}")
-        print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("Smart Plant Monitoring System - Raspberry Pi")
+        logger.info("=" * 60)
+        logger.info("Device ID: %s", CFG.DEVICE_ID)
+        logger.info("API URL: %s", CFG.API_BASE_URL)
+        logger.info("Started: %s", time.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info("=" * 60)
         
         # Initialize components
         self.sensor_reader = SensorReader()
@@ -43,29 +50,45 @@ class PlantMonitor:
         
         # Plant thresholds (loaded from API after image upload)
         self.thresholds = {
-            'soil_min': DEFAULT_SOIL_MIN,
-            'soil_max': DEFAULT_SOIL_MAX,
-            'temp_min': DEFAULT_TEMP_MIN,
-            'temp_max': DEFAULT_TEMP_MAX,
-            'humidity_min': DEFAULT_HUMIDITY_MIN,
-            'humidity_max': DEFAULT_HUMIDITY_MAX,
-            'light_min': DEFAULT_LIGHT_MIN,
-            'light_max': DEFAULT_LIGHT_MAX
+            'soil_min': CFG.DEFAULT_SOIL_MIN,
+            'soil_max': CFG.DEFAULT_SOIL_MAX,
+            'temp_min': CFG.DEFAULT_TEMP_MIN,
+            'temp_max': CFG.DEFAULT_TEMP_MAX,
+            'humidity_min': CFG.DEFAULT_HUMIDITY_MIN,
+            'humidity_max': CFG.DEFAULT_HUMIDITY_MAX,
+            'light_min': CFG.DEFAULT_LIGHT_MIN,
+            'light_max': CFG.DEFAULT_LIGHT_MAX
         }
         
-        # Timing trackers
-        self.last_telemetry_time = 0
-        self.last_image_time = 0
-        self.last_command_poll_time = 0
-        self.last_auto_water_check = 0
+        # Auto-watering piggybacks on telemetry, at its own slower cadence
+        self.last_auto_water_check = None
+        
+        # Last queued (soil, temp, humidity, light) and when, for skipping repeats
+        self._last_sent = None
+        self._last_sent_time = None
+        
+        # Set by shutdown() to stop the command listener
+        self._stop_event = threading.Event()
+        
+        # Commands pushed by the long-poll listener thread; _wake interrupts
+        # the scheduler's sleep so they run immediately (also set on shutdown)
+        self._command_queue = queue.Queue()
+        self._wake = threading.Event()
+        self._command_thread = None
+        
+        # Image capture + upload runs off the main loop; one at a time
+        self._image_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image')
+        self._image_future = None
         
         # Plant identification info
         self.identified_plant = None
+        # Plant type whose thresholds are applied (id, or name if no id)
+        self._last_plant = None
         
         # Running flag
         self.running = False
         
-        print("✓ All components initialized")
+        logger.info("✓ All components initialized")
     
     def update_thresholds_from_api(self, plant_data: Dict):
         """
@@ -78,29 +101,38 @@ class PlantMonitor:
             # Look for dominant detection with plant type
             detections = plant_data.get('detections', [])
             if not detections:
-                print("No plant detections in API response")
+                logger.info("No plant detections in API response")
                 return
             
-            # Get dominant detection (first one with highest confidence)
-            dominant = max(detections, key=lambda d: d.get('confidence', 0))
+            # The backend sorts detections by confidence, highest first.
+            # Checked in DEBUG_MODE only; `python -O` drops the check entirely.
+            dominant = detections[0]
+            if __debug__ and CFG.DEBUG_MODE and any(d.get('confidence', 0) > dominant.get('confidence', 0) for d in detections):
+                logger.warning("Detections not sorted by confidence; using the first one")
             
             plant_type = dominant.get('plantType')
             if plant_type and plant_type.get('thresholds'):
-                new_thresholds = plant_type['thresholds']
-                self.thresholds.update(new_thresholds)
-                
                 plant_name = plant_type.get('name', 'Unknown')
+                
+                # Same plant as last time: the backend returns the same thresholds
+                plant_key = plant_type.get('id', plant_name)
+                if plant_key == self._last_plant:
+                    return
+                
+                self.thresholds.update(plant_type['thresholds'])
+                self._last_plant = plant_key
                 self.identified_plant = plant_name
                 
-                print(f"✓ Updated thresholds for {plant_name}:")
-                print(f"  Soil: {self.thresholds.get('soil_min')}-{self.thresholds.get('soil_max')}%")
-                print(f"  Temp: {self.thresholds.get('temp_min')}-{self.thresholds.get('temp_max')}°C")
-                print(f"  Humidity: {self.thresholds.get('humidity_min')}-{self.thresholds.get('humidity_max')}%")
+                t = self.thresholds
+                logger.info("✓ Updated thresholds for %s:", plant_name)
+                logger.info("  Soil: %s-%s%%", t.get('soil_min'), t.get('soil_max'))
+                logger.info("  Temp: %s-%s°C", t.get('temp_min'), t.get('temp_max'))
+                logger.info("  Humidity: %s-%s%%", t.get('humidity_min'), t.get('humidity_max'))
             else:
-                print("No plant type thresholds in API response")
+                logger.info("No plant type thresholds in API response")
                 
         except Exception as e:
-            print(f"Error updating thresholds: {e}")
+            logger.error("Error updating thresholds: %s", e)
     
     def check_and_water_if_needed(self, sensor_data: Dict) -> bool:
         """
@@ -112,7 +144,7 @@ class PlantMonitor:
         Returns:
             True if watered
         """
-        if not ENABLE_AUTO_WATERING:
+        if not CFG.ENABLE_AUTO_WATERING:
             return False
         
         soil_moisture = sensor_data.get('soil_pct')
@@ -121,126 +153,157 @@ class PlantMonitor:
         
         # Check if soil moisture below minimum threshold
         if soil_moisture < self.thresholds['soil_min']:
-            print(f"⚠ Soil moisture low: {soil_moisture}% < {self.thresholds['soil_min']}%")
-            print("Initiating automatic watering...")
+            logger.warning("⚠ Soil moisture low: %s%% < %s%%", soil_moisture, self.thresholds['soil_min'])
+            logger.info("Initiating automatic watering...")
             
-            result = self.pump.activate(AUTO_WATER_DURATION, reason="auto")
+            result = self.pump.activate(CFG.AUTO_WATER_DURATION, reason="auto")
             
             if result['success']:
-                print(f"✓ Auto-watering completed: {result['duration']:.1f}s")
+                logger.info("✓ Auto-watering completed: %.1fs", result['duration'])
+                self.sensor_reader.invalidate()
                 
                 # Send telemetry update after watering
                 time.sleep(2)  # Wait for soil to absorb
                 new_reading = self.sensor_reader.read_all()
-                self.api_client.send_telemetry(new_reading)
+                self.api_client.enqueue_telemetry(new_reading)
                 
                 return True
             else:
-                print(f"✗ Auto-watering failed: {result['reason']}")
+                logger.error("✗ Auto-watering failed: %s", result['reason'])
         
         return False
     
-    def process_telemetry(self):
-        """Read sensors and send telemetry to backend"""
-        current_time = time.time()
-        
-        if current_time - self.last_telemetry_time < TELEMETRY_INTERVAL:
-            return
+    def process_telemetry(self, now: float):
+        """
+        Read sensors and send telemetry to backend
         
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Reading sensors...")
+        Args:
+            now: Monotonic time of this scheduler tick
+        """
+        logger.debug("Reading sensors...")
         
         # Read all sensors
         sensor_data = self.sensor_reader.read_all()
         
         # Validate reading
         if not self.sensor_reader.is_reading_valid(sensor_data):
-            print("⚠ Invalid sensor reading - skipping")
+            logger.warning("⚠ Invalid sensor reading - skipping")
             return
         
-        # Display readings
-        if sensor_data.get('soil_pct') is not None:
-            print(f"  Soil: {sensor_data['soil_pct']}%")
-        if sensor_data.get('temperature_c') is not None:
-            print(f"  Temperature: {sensor_data['temperature_c']}°C")
-        if sensor_data.get('humidity_pct') is not None:
-            print(f"  Humidity: {sensor_data['humidity_pct']}%")
-        if sensor_data.get('lux') is not None:
-            print(f"  Light: {sensor_data['lux']} lux")
-        
-        # Send to backend
-        success = self.api_client.send_telemetry(sensor_data)
-        if success:
-            print("✓ Telemetry sent")
-        else:
-            print("✗ Telemetry send failed")
+        values = (sensor_data.get('soil_pct'), sensor_data.get('temperature_c'),
+                  sensor_data.get('humidity_pct'), sensor_data.get('lux'))
         
-        self.last_telemetry_time = current_time
+        # Only send changes, plus a heartbeat; the backend forward-fills gaps
+        if values == self._last_sent and now - self._last_sent_time < CFG.TELEMETRY_HEARTBEAT_INTERVAL:
+            logger.debug("Readings unchanged - telemetry skipped")
+            # Still send an already-queued partial batch once it is old enough
+            self.api_client.maybe_flush(now)
+        else:
+            # Queue for background delivery to backend
+            self.api_client.enqueue_telemetry(sensor_data)
+            self._last_sent = values
+            self._last_sent_time = now
+            logger.info("✓ Telemetry queued: soil %s%%, temperature %s°C, humidity %s%%, light %s lux", *values)
         
         # Check if automatic watering needed
-        if current_time - self.last_auto_water_check >= AUTO_WATER_CHECK_INTERVAL:
+        if self.last_auto_water_check is None or now - self.last_auto_water_check >= CFG.AUTO_WATER_CHECK_INTERVAL:
             self.check_and_water_if_needed(sensor_data)
-            self.last_auto_water_check = current_time
+            self.last_auto_water_check = now
     
-    def process_image_capture(self):
-        """Capture and upload image for AI analysis"""
-        current_time = time.time()
-        
-        if current_time - self.last_image_time < IMAGE_CAPTURE_INTERVAL:
+    def process_image_capture(self, now: float):
+        """Start a background capture and upload of an image for AI analysis"""
+        if self._image_future is not None:
+            logger.warning("⚠ Previous image upload still in progress - skipping")
             return
         
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Capturing image...")
+        logger.info("Capturing image...")
         
-        # Capture image
-        image_bytes = self.camera.capture_image()
-        if not image_bytes:
-            print("✗ Image capture failed")
-            return
+        self._image_future = self._image_executor.submit(self._capture_and_upload)
+        # Wake the main loop to apply the result as soon as it is ready
+        self._image_future.add_done_callback(lambda _: self._wake.set())
+    
+    def _capture_and_upload(self) -> Optional[Dict]:
+        """Capture an image and upload it (runs on the image executor)"""
+        image = self.camera.capture_image()
+        if not image:
+            logger.error("✗ Image capture failed")
+            return None
         
-        print(f"✓ Image captured ({len(image_bytes)} bytes)")
+        logger.info("✓ Image captured (%d bytes)", image.getbuffer().nbytes)
         
         # Upload to backend for AI analysis
-        print("Uploading image for AI analysis...")
-        result = self.api_client.upload_image(image_bytes)
+        logger.info("Uploading image for AI analysis...")
+        result = self.api_client.upload_image(image)
+        
+        if not result:
+            logger.error("✗ Image upload failed")
+        return result
+    
+    def collect_image_result(self):
+        """Apply the AI result of a finished background upload on the main thread"""
+        future = self._image_future
+        if future is None or not future.done():
+            return
+        self._image_future = None
         
+        result = future.result()
         if result:
-            print("✓ Image uploaded successfully")
+            logger.info("✓ Image uploaded successfully")
             
             # Display AI detection results
             detections = result.get('detections', [])
             if detections:
-                print(f"AI detected {len(detections)} plant(s):")
+                logger.info("AI detected %d plant(s):", len(detections))
                 for detection in detections:
-                    label = detection.get('label', 'Unknown')
-                    confidence = detection.get('confidence', 0) * 100
-                    print(f"  - {label} ({confidence:.1f}% confidence)")
+                    logger.info("  - %s (%.1f%% confidence)",
+                                detection.get('label', 'Unknown'), detection.get('confidence', 0) * 100)
             
             # Update thresholds from plant type
             self.update_thresholds_from_api(result)
-        else:
-            print("✗ Image upload failed")
-        
-        self.last_image_time = current_time
+    
+    def _command_listener(self):
+        """Long-poll the backend and hand new commands to the main loop (own thread)"""
+        # Commands stay pending until the main loop acknowledges them, so a
+        # long-poll can return the same one again; only forward it once
+        forwarded = deque(maxlen=64)
+        # Wait before re-polling after a repeat, doubling up to
+        # COMMAND_POLL_INTERVAL while acks stay undelivered
+        repeat_delay = 1
+        try:
+            for command in self.api_client.poll_commands_stream():
+                if command.get('id') in forwarded:
+                    # Give the main loop a moment to acknowledge it
+                    self._stop_event.wait(repeat_delay)
+                    repeat_delay = min(repeat_delay * 2, CFG.COMMAND_POLL_INTERVAL)
+                    continue
+                repeat_delay = 1
+                forwarded.append(command.get('id'))
+                self._command_queue.put(command)
+                self._wake.set()
+        except Exception as e:
+            # The HTTP client is closed under us during shutdown
+            if self.running:
+                logger.error("✗ Command listener stopped: %s", e)
     
     def process_commands(self):
-        """Poll for and execute commands from backend"""
-        current_time = time.time()
-        
-        if current_time - self.last_command_poll_time < COMMAND_POLL_INTERVAL:
-            return
-        
-        # Poll for commands
-        commands = self.api_client.poll_commands()
+        """Execute commands delivered by the listener thread"""
+        commands = []
+        while True:
+            try:
+                commands.append(self._command_queue.get_nowait())
+            except queue.Empty:
+                break
         
         if not commands:
-            self.last_command_poll_time = current_time
             return
         
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Processing {len(commands)} command(s)...")
+        logger.info("Processing %d command(s)...", len(commands))
         
         for command in commands:
             self.execute_command(command)
         
-        self.last_command_poll_time = current_time
+        # Final statuses for the whole burst go out in one request
+        self.api_client.flush_acks()
     
     def execute_command(self, command: Dict):
         """
@@ -253,13 +316,14 @@ class PlantMonitor:
         command_type = command.get('type')
         payload = command.get('payload', {})
         
-        print(f"Executing command {command_id}: {command_type}")
+        logger.info("Executing command %s: %s", command_id, command_type)
         
         if command_type == 'water':
             # Water command
             duration = payload.get('duration', 5)
             
-            # Acknowledge start
+            # Acknowledge start right away, so the command isn't re-delivered
+            # (and run twice) while the pump is running
             self.api_client.acknowledge_command(command_id, 'started')
             
             # Execute
@@ -267,119 +331,167 @@ class PlantMonitor:
             
             # Acknowledge completion
             if result['success']:
+                self.sensor_reader.invalidate()
                 self.api_client.acknowledge_command(
                     command_id,
                     'completed',
                     {
                         'duration_executed': result['duration'],
                         'timestamp': result['timestamp']
-                    }
+                    },
+                    defer=True
                 )
-                print(f"✓ Water command completed: {result['duration']:.1f}s")
+                logger.info("✓ Water command completed: %.1fs", result['duration'])
             else:
                 self.api_client.acknowledge_command(
                     command_id,
                     'failed',
-                    {'error': result['reason']}
+                    {'error': result['reason']},
+                    defer=True
                 )
-                print(f"✗ Water command failed: {result['reason']}")
+                logger.error("✗ Water command failed: %s", result['reason'])
         
         else:
-            print(f"⚠ Unknown command type: {command_type}")
+            logger.warning("⚠ Unknown command type: %s", command_type)
             self.api_client.acknowledge_command(
                 command_id,
                 'failed',
-                {'error': f'Unknown command type: {command_type}'}
+                {'error': f'Unknown command type: {command_type}'},
+                defer=True
             )
     
-    def display_status(self):
+    def display_status(self, now: float):
         """Display current system status"""
-        print("\n" + "=" * 60)
-        print("SYSTEM STATUS")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("SYSTEM STATUS")
+        logger.info("=" * 60)
         
         # Plant info
-        if self.identified_plant:
-            print(f"Identified Plant: {self.identified_plant}")
-        else:
-            print("Identified Plant: Not yet identified")
+        logger.info("Identified Plant: %s", self.identified_plant or "Not yet identified")
         
         # API connection
         api_health = self.api_client.get_health()
         connection_status = "✓ Connected" if api_health['connected'] else "✗ Disconnected"
-        print(f"Backend Connection: {connection_status}")
+        logger.info("Backend Connection: %s", connection_status)
         
         # Pump status
         pump_status = self.pump.get_status()
-        print(f"Pump: {'Running' if pump_status['is_running'] else 'Idle'}")
-        print(f"Total Activations: {pump_status['total_activations']}")
+        logger.info("Pump: %s", 'Running' if pump_status['is_running'] else 'Idle')
+        logger.info("Total Activations: %s", pump_status['total_activations'])
         
         # Current thresholds
-        print("\nActive Thresholds:")
-        print(f"  Soil Moisture: {self.thresholds['soil_min']}-{self.thresholds['soil_max']}%")
-        print(f"  Temperature: {self.thresholds['temp_min']}-{self.thresholds['temp_max']}°C")
-        print(f"  Humidity: {self.thresholds['humidity_min']}-{self.thresholds['humidity_max']}%")
+        t = self.thresholds
+        logger.info("Active Thresholds:")
+        logger.info("  Soil Moisture: %s-%s%%", t['soil_min'], t['soil_max'])
+        logger.info("  Temperature: %s-%s°C", t['temp_min'], t['temp_max'])
+        logger.info("  Humidity: %s-%s%%", t['humidity_min'], t['humidity_max'])
         
-        print("=" * 60)
+        logger.info("=" * 60)
     
     def run(self):
         """Main application loop"""
         self.running = True
         
-        print("\nStarting main loop...")
-        print("Press Ctrl+C to stop\n")
-        
-        # Display status every 60 seconds
-        last_status_display = 0
+        logger.info("Starting main loop...")
+        logger.info("Press Ctrl+C to stop")
+        
+        # Commands arrive through a long-poll on a background thread
+        self._command_thread = threading.Thread(target=self._command_listener, name='commands', daemon=True)
+        self._command_thread.start()
+        
+        # Min-heap of (next_due, seq, interval, task) on the monotonic clock;
+        # seq breaks ties so tasks are never compared. Tasks are called with
+        # the tick's monotonic time. Everything runs once at startup, in
+        # this order.
+        now = time.monotonic()
+        schedule = [
+            (now, 0, CFG.TELEMETRY_INTERVAL, self.process_telemetry),
+            (now, 1, CFG.IMAGE_CAPTURE_INTERVAL, self.process_image_capture),
+            (now, 2, CFG.STATUS_DISPLAY_INTERVAL, self.display_status),
+        ]
+        heapq.heapify(schedule)
         
         try:
             while self.running:
-                # Process telemetry
-                self.process_telemetry()
+                due = schedule[0][0]
                 
-                # Process image capture
-                self.process_image_capture()
+                # Sleep until the next task is due; a new command or
+                # shutdown() wakes us early
+                self._wake.wait(max(0.0, due - time.monotonic()))
+                self._wake.clear()
+                if not self.running:
+                    break
+                
+                now = time.monotonic()
                 
-                # Process commands
                 self.process_commands()
+                # Retry acks that failed to send (backs off inside)
+                self.api_client.flush_acks(force=False)
+                self.collect_image_result()
+                
+                if now < due:
+                    continue
                 
-                # Display status periodically
-                if time.time() - last_status_display >= 60:
-                    self.display_status()
-                    last_status_display = time.time()
+                due, seq, interval, task = heapq.heappop(schedule)
+                task(now)
                 
-                # Sleep briefly to prevent CPU spinning
-                time.sleep(1)
+                # Keep the cadence, but don't burst to catch up after an overrun
+                heapq.heappush(schedule, (max(due + interval, now), seq, interval, task))
                 
         except KeyboardInterrupt:
-            print("\n\nShutdown requested by user...")
+            logger.info("Shutdown requested by user...")
         except Exception as e:
-            print(f"\n\nFATAL ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("FATAL ERROR: %s", e)
         finally:
             self.shutdown()
     
     def shutdown(self):
         """Cleanup and shutdown"""
-        print("\nShutting down...")
+        logger.info("Shutting down...")
         self.running = False
+        self._stop_event.set()
+        self._wake.set()
         
         # Emergency stop pump
         self.pump.emergency_stop()
         
+        # Let an in-flight capture finish before the camera is closed
+        self._image_executor.shutdown(wait=True, cancel_futures=True)
+        
         # Cleanup resources
         self.sensor_reader.cleanup()
         self.camera.cleanup()
         self.pump.cleanup()
+        self.api_client.close()
         
-        print("✓ Shutdown complete")
-        print(f"Stopped: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("✓ Shutdown complete")
+        logger.info("Stopped: %s", time.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def setup_logging():
+    """Configure logging once: rotating log file plus console output"""
+    level = logging.DEBUG if CFG.DEBUG_MODE else getattr(logging, CFG.LOG_LEVEL.upper(), logging.INFO)
+    
+    file_handler = RotatingFileHandler(CFG.LOG_FILE, maxBytes=CFG.LOG_MAX_BYTES, backupCount=CFG.LOG_BACKUP_COUNT)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S'))
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(file_handler)
+    root.addHandler(console_handler)
+    
+    # httpx/httpcore log every request at INFO (each long-poll, batch and ack)
+    if not CFG.DEBUG_MODE:
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+        logging.getLogger('httpcore').setLevel(logging.WARNING)
 
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
-    print("\n\n⚠ Received interrupt signal...")
+    logger.warning("⚠ Received interrupt signal...")
     # Trigger cleanup through monitor instance if available
     if 'monitor' in globals() and hasattr(monitor, 'shutdown'):
         monitor.shutdown()
@@ -387,6 +499,10 @@ def signal_handler(sig, frame):
 
 
 if __name__ == "__main__":
+    # Console output uses ✓/⚠ glyphs; don't fail on an ASCII-only locale
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    setup_logging()
+    
     # Setup signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -397,6 +513,6 @@ if __name__ == "__main__":
     try:
         monitor.run()
     except Exception as e:
-        print(f"\n🚨 Unexpected error: {e}")
+        logger.critical("🚨 Unexpected error: %s", e)
         monitor.shutdown()
         raise
@@ -3,17 +3,29 @@ Water pump control module for Raspberry Pi Plant Monitoring System
 Handles water pump activation with safety checks
 """
 
+import asyncio
+import logging
+import threading
 import time
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+try:
+    import lgpio
+    LGPIO_AVAILABLE = True
+except ImportError:
+    LGPIO_AVAILABLE = False
+
 try:
     import RPi.GPIO as GPIO
     RPI_AVAILABLE = True
 except ImportError:
     RPI_AVAILABLE = False
-    print("Warning: RPi.GPIO not available. Using mock pump.")
+    if not LGPIO_AVAILABLE:
+        logger.warning("lgpio/RPi.GPIO not available. Using mock pump.")
 
-from config import *
+from config import CFG
 
 
 class PumpController:
@@ -25,35 +37,78 @@ class PumpController:
         
         Args:
             use_mock: Use mock pump instead of real GPIO (for testing)
-                     If None, will use ENABLE_PUMP config setting
+                     If None, will use CFG.ENABLE_PUMP config setting
         """
         # Determine if we should use mock mode
         if use_mock is None:
-            # Use mock if pump is disabled OR if RPi.GPIO is not available
-            self.use_mock = not ENABLE_PUMP or not RPI_AVAILABLE
+            # Use mock if pump is disabled OR if no GPIO library is available
+            self.use_mock = not CFG.ENABLE_PUMP or not (LGPIO_AVAILABLE or RPI_AVAILABLE)
         else:
             self.use_mock = use_mock
             
-        self.last_activation_time = 0
+        # Monotonic clock for interval enforcement (immune to NTP jumps);
+        # wall-clock time is kept only for status reporting
+        self.last_activation_time = None
+        self.last_activation_wall_time = None
+        self._next_allowed_monotonic = 0.0
         self.total_activations = 0
         self.is_running = False
         
-        if not self.use_mock:
+        # Set by emergency_stop() to cut a running activation short; cleared
+        # only once that activation is over
+        self._stop_event = threading.Event()
+        # Guards admission, switch-on and emergency stop against each other.
+        # Reentrant because the shutdown signal handler can call
+        # emergency_stop() on a thread that is inside activate().
+        self._state_lock = threading.RLock()
+        
+        # Serialises activate_async() callers; created on first async use
+        # so it binds to the running event loop
+        self._async_lock = None
+        
+        # Relay polarity resolved once (1/0 match GPIO.HIGH/LOW and lgpio levels)
+        self._on_level, self._off_level = (1, 0) if CFG.PUMP_ACTIVE_HIGH else (0, 1)
+        
+        # lgpio chip handle; None when driving the pin through RPi.GPIO
+        self._h = None
+        
+        if not self.use_mock and LGPIO_AVAILABLE:
+            self._init_lgpio()
+        
+        if not self.use_mock and self._h is None:
             GPIO.setmode(GPIO.BCM)
             GPIO.setwarnings(False)
-            GPIO.setup(PUMP_GPIO_PIN, GPIO.OUT)
+            GPIO.setup(CFG.PUMP_GPIO_PIN, GPIO.OUT)
             
             # Ensure pump is off initially
-            initial_state = GPIO.LOW if PUMP_ACTIVE_HIGH else GPIO.HIGH
-            GPIO.output(PUMP_GPIO_PIN, initial_state)
+            GPIO.output(CFG.PUMP_GPIO_PIN, self._off_level)
         
         mode = 'MOCK' if self.use_mock else 'REAL'
         reason = ''
-        if self.use_mock and not ENABLE_PUMP:
+        if self.use_mock and not CFG.ENABLE_PUMP:
             reason = ' (ENABLE_PUMP=False)'
-        elif self.use_mock and not RPI_AVAILABLE:
-            reason = ' (RPi.GPIO not available)'
-        print(f"PumpController initialized: {mode}{reason}")
+        elif self.use_mock and not (LGPIO_AVAILABLE or RPI_AVAILABLE):
+            reason = ' (lgpio/RPi.GPIO not available)'
+        elif self._h is not None:
+            reason = ' (lgpio)'
+        logger.info("PumpController initialized: %s%s", mode, reason)
+    
+    def _init_lgpio(self):
+        """Claim the pump pin through the /dev/gpiochip character device"""
+        h = None
+        try:
+            h = lgpio.gpiochip_open(CFG.GPIO_CHIP)
+            # Claim as output with the pump off
+            lgpio.gpio_claim_output(h, CFG.PUMP_GPIO_PIN, self._off_level)
+        except lgpio.error as e:
+            logger.warning("Cannot claim pump pin through lgpio (%s)", e)
+            if h is not None:
+                lgpio.gpiochip_close(h)
+            if not RPI_AVAILABLE:
+                self.use_mock = True
+            return
+        
+        self._h = h
     
     def _set_pump_state(self, active: bool):
         """
@@ -63,29 +118,32 @@ class PumpController:
             active: True to turn pump on, False to turn off
         """
         if self.use_mock:
-            print(f"[MOCK] Pump {'ON' if active else 'OFF'}")
+            logger.debug("[MOCK] Pump %s", 'ON' if active else 'OFF')
+            return
+        
+        level = self._on_level if active else self._off_level
+        if self._h is not None:
+            lgpio.gpio_write(self._h, CFG.PUMP_GPIO_PIN, level)
             return
         
         # Ensure GPIO is initialized before using it
         try:
-            if PUMP_ACTIVE_HIGH:
-                GPIO.output(PUMP_GPIO_PIN, GPIO.HIGH if active else GPIO.LOW)
-            else:
-                GPIO.output(PUMP_GPIO_PIN, GPIO.LOW if active else GPIO.HIGH)
+            GPIO.output(CFG.PUMP_GPIO_PIN, level)
         except RuntimeError as e:
             if "pin numbering mode" in str(e):
                 # GPIO not initialized, reinitialize
                 GPIO.setmode(GPIO.BCM)
                 GPIO.setwarnings(False)
-                GPIO.setup(PUMP_GPIO_PIN, GPIO.OUT)
+                GPIO.setup(CFG.PUMP_GPIO_PIN, GPIO.OUT)
                 # Try again
-                if PUMP_ACTIVE_HIGH:
-                    GPIO.output(PUMP_GPIO_PIN, GPIO.HIGH if active else GPIO.LOW)
-                else:
-                    GPIO.output(PUMP_GPIO_PIN, GPIO.LOW if active else GPIO.HIGH)
+                GPIO.output(CFG.PUMP_GPIO_PIN, level)
             else:
                 raise
     
+    def _ready(self) -> bool:
+        """Cheap safety check without building a reason string"""
+        return not self.is_running and time.monotonic() >= self._next_allowed_monotonic
+    
     def can_activate(self) -> tuple[bool, Optional[str]]:
         """
         Check if pump can be activated (safety checks)
@@ -93,17 +151,14 @@ class PumpController:
         Returns:
             Tuple of (can_activate, reason_if_cannot)
         """
-        # Check if already running
+        if self._ready():
+            return True, None
+        
+        # Only format a reason when activation is refused
         if self.is_running:
             return False, "Pump already running"
-        
-        # Check minimum interval since last activation
-        time_since_last = time.time() - self.last_activation_time
-        if time_since_last < PUMP_MIN_INTERVAL:
-            remaining = int(PUMP_MIN_INTERVAL - time_since_last)
-            return False, f"Must wait {remaining}s before next activation"
-        
-        return True, None
+        remaining = int(self._next_allowed_monotonic - time.monotonic())
+        return False, f"Must wait {remaining}s before next activation"
     
     def activate(self, duration: float, reason: str = "manual") -> dict:
         """
@@ -117,12 +172,15 @@ class PumpController:
             Dictionary with activation result
         """
         # Safety check: cap duration
-        duration = min(duration, PUMP_MAX_DURATION)
+        duration = min(duration, CFG.PUMP_MAX_DURATION)
         
         # Check if can activate
-        can_activate, reason_cannot = self.can_activate()
+        with self._state_lock:
+            can_activate, reason_cannot = self.can_activate()
+            if can_activate:
+                self.is_running = True
         if not can_activate:
-            print(f"Cannot activate pump: {reason_cannot}")
+            logger.info("Cannot activate pump: %s", reason_cannot)
             return {
                 'success': False,
                 'reason': reason_cannot,
@@ -130,36 +188,52 @@ class PumpController:
             }
         
         try:
-            print(f"Activating pump for {duration}s ({reason})...")
-            self.is_running = True
+            logger.info("Activating pump for %ss (%s)...", duration, reason)
             
-            # Turn on pump
-            start_time = time.time()
-            self._set_pump_state(True)
+            # Turn on pump, unless an emergency stop arrived since the check
+            with self._state_lock:
+                if self._stop_event.is_set():
+                    logger.warning("Pump activation cancelled by emergency stop")
+                    self.is_running = False
+                    return {
+                        'success': False,
+                        'reason': "Emergency stop",
+                        'duration': 0
+                    }
+                start_time = time.monotonic()
+                self._set_pump_state(True)
             
-            # Wait for duration
-            time.sleep(duration)
+            # Wait for duration, waking immediately on emergency stop
+            interrupted = self._stop_event.wait(duration)
             
             # Turn off pump
             self._set_pump_state(False)
-            actual_duration = time.time() - start_time
+            end_time = time.monotonic()
+            actual_duration = end_time - start_time
+            timestamp = time.time()
             
             # Update tracking
-            self.last_activation_time = time.time()
+            self.last_activation_time = end_time
+            self.last_activation_wall_time = timestamp
+            self._next_allowed_monotonic = end_time + CFG.PUMP_MIN_INTERVAL
             self.total_activations += 1
             self.is_running = False
             
-            print(f"Pump activation complete: {actual_duration:.1f}s")
+            if interrupted:
+                logger.warning("Pump activation interrupted after %.1fs", actual_duration)
+            else:
+                logger.info("Pump activation complete: %.1fs", actual_duration)
             
             return {
                 'success': True,
                 'duration': actual_duration,
                 'reason': reason,
-                'timestamp': time.time()
+                'timestamp': timestamp,
+                'interrupted': interrupted
             }
             
         except Exception as e:
-            print(f"Error during pump activation: {e}")
+            logger.error("Error during pump activation: %s", e)
             # Emergency shutoff
             self._set_pump_state(False)
             self.is_running = False
@@ -169,15 +243,43 @@ class PumpController:
                 'reason': f"Error: {str(e)}",
                 'duration': 0
             }
+        
+        finally:
+            # Re-arm for the next activation
+            self._stop_event.clear()
+    
+    async def activate_async(self, duration: float, reason: str = "manual") -> dict:
+        """
+        Activate water pump without blocking the event loop
+        
+        Runs activate() in a worker thread so the loop keeps serving
+        sensor reads and API calls while the pump is on.
+        
+        Args:
+            duration: Duration in seconds
+            reason: Reason for activation ("manual", "auto", "command")
+            
+        Returns:
+            Dictionary with activation result
+        """
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            return await asyncio.to_thread(self.activate, duration, reason)
     
     def emergency_stop(self):
         """Emergency stop - immediately turn off pump"""
-        print("EMERGENCY STOP: Shutting down pump")
-        try:
-            self._set_pump_state(False)
-        except Exception as e:
-            print(f"Warning during emergency stop: {e}")
-        self.is_running = False
+        logger.critical("EMERGENCY STOP: Shutting down pump")
+        with self._state_lock:
+            # Only an admitted activation is cancelled; a stop while idle
+            # doesn't block the next one
+            if self.is_running:
+                self._stop_event.set()
+            try:
+                self._set_pump_state(False)
+            except Exception as e:
+                logger.warning("Warning during emergency stop: %s", e)
+            self.is_running = False
     
     def get_status(self) -> dict:
         """
@@ -186,14 +288,17 @@ class PumpController:
         Returns:
             Dictionary with pump status
         """
-        time_since_last = time.time() - self.last_activation_time if self.last_activation_time > 0 else None
+        if self.last_activation_time is not None:
+            time_since_last = int(time.monotonic() - self.last_activation_time)
+        else:
+            time_since_last = None
         
         return {
             'is_running': self.is_running,
             'total_activations': self.total_activations,
-            'last_activation': self.last_activation_time if self.last_activation_time > 0 else None,
-            'seconds_since_last': int(time_since_last) if time_since_last else None,
-            'can_activate': self.can_activate()[0]
+            'last_activation': self.last_activation_wall_time,
+            'seconds_since_last': time_since_last,
+            'can_activate': self._ready()
         }
     
     def cleanup(self):
@@ -202,18 +307,26 @@ class PumpController:
         try:
             self._set_pump_state(False)
         except Exception as e:
-            print(f"Warning during cleanup: {e}")
+            logger.warning("Warning during cleanup: %s", e)
         
-        if not self.use_mock and RPI_AVAILABLE:
+        if self._h is not None:
             try:
-                GPIO.cleanup(PUMP_GPIO_PIN)
-                print("Pump GPIO cleanup completed")
+                lgpio.gpio_free(self._h, CFG.PUMP_GPIO_PIN)
+                lgpio.gpiochip_close(self._h)
+                self._h = None
+                logger.info("Pump GPIO cleanup completed")
+            except lgpio.error as e:
+                logger.warning("Warning during GPIO cleanup: %s", e)
+        elif not self.use_mock and RPI_AVAILABLE:
+            try:
+                GPIO.cleanup(CFG.PUMP_GPIO_PIN)
+                logger.info("Pump GPIO cleanup completed")
             except Exception as e:
-                print(f"Warning during GPIO cleanup: {e}")
+                logger.warning("Warning during GPIO cleanup: %s", e)
 
 
-# Test the pump controller
-if __name__ == "__main__":
+def _selftest():
+    """Exercise the pump controller in mock mode"""
     print("Testing pump controller...")
     pump = PumpController(use_mock=True)
     
@@ -231,8 +344,8 @@ if __name__ == "__main__":
     result = pump.activate(2, reason="test")
     print(f"Result: {result}")
     
-    print(f"\nWaiting {PUMP_MIN_INTERVAL} seconds before next test...")
-    time.sleep(PUMP_MIN_INTERVAL + 1)
+    print(f"\nWaiting {CFG.PUMP_MIN_INTERVAL} seconds before next test...")
+    time.sleep(CFG.PUMP_MIN_INTERVAL + 1)
     
     print("\nTest 3: Activation after cooldown")
     result = pump.activate(2, reason="test")
@@ -240,3 +353,8 @@ if __name__ == "__main__":
     
     pump.cleanup()
     print("\nTest complete!")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if CFG.DEBUG_MODE else logging.INFO)
+    _selftest()
@@ -3,26 +3,165 @@ Sensor reading module for Raspberry Pi Plant Monitoring System
 Handles reading from soil moisture, temperature, humidity, and light sensors
 """
 
+import os
+import sys
+import asyncio
+import importlib.util
+import logging
 import time
-import random
+import itertools
+import threading
+from array import array
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# Only probe for RPi.GPIO and the Adafruit (Blinka) stack here; they are
+# slow to import and only imported when real sensors are opened.
+RPI_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                    for name in ('RPi', 'adafruit_dht', 'board'))
+if not RPI_AVAILABLE:
+    logger.warning("RPi.GPIO or Adafruit libraries not available. Using mock sensors.")
+
+try:
+    import spidev
+    SPIDEV_AVAILABLE = True
+except ImportError:
+    SPIDEV_AVAILABLE = False
+
+try:
+    import lgpio
+    LGPIO_AVAILABLE = True
+except ImportError:
+    LGPIO_AVAILABLE = False
+
 try:
-    import RPi.GPIO as GPIO
-    import adafruit_dht
-    import board
-    RPI_AVAILABLE = True
+    import pigpio
+    PIGPIO_AVAILABLE = True
 except ImportError:
-    RPI_AVAILABLE = False
-    print("Warning: RPi.GPIO or Adafruit libraries not available. Using mock sensors.")
+    PIGPIO_AVAILABLE = False
 
-from config import *
+from config import CFG
+
+# Pre-generated 10-bit samples that mock mode cycles through
+_MOCK_BUFFER_SIZE = 4096
+
+# Reading for every 10-bit ADC code, so a sensor read is a single index.
+# Soil: higher ADC = drier soil, so invert. Light: higher ADC = brighter.
+_SOIL_PCT_LUT = tuple(round(max(0, min(100, 100 - ((code / 1023.0) * 100))), 1) for code in range(1024))
+_LUX_LUT = tuple(round((code / 1023.0) * 2000, 0) for code in range(1024))
+
+# DHT22 start signal: the host holds the line low for at least 1 ms (the
+# AM2302 accepts up to ~20 ms). 1.1 ms leaves sleep() overshoot plenty of room.
+_DHT22_START_PULSE = 0.0011
+
+# MOSI bits (start, single-ended, D2..D0) for each MCP3008 channel, MSB first
+_ADC_COMMAND_BITS = tuple(
+    tuple((((ch | 0x18) << 3) >> (7 - i)) & 1 for i in range(5))
+    for ch in range(8)
+)
+
+
+class _PigpioDHT22:
+    """
+    DHT22 driver built on pigpio edge callbacks
+    
+    pigpiod samples the pin from a DMA-timed loop and reports each edge
+    with a microsecond tick, so decoding the 40-bit frame costs a few
+    callbacks instead of a busy-waiting Python bit-bang.
+    """
+    
+    def __init__(self, pi, gpio: int):
+        self.pi = pi
+        self.gpio = gpio
+        self.temperature = None
+        self.humidity = None
+        self.last_update = None      # monotonic time of the last good frame
+        self._last_trigger = None
+        self._bit = 40               # idle until trigger()
+        self._data = 0
+        self._high_tick = 0
+        self._frame_done = threading.Event()
+        
+        pi.set_pull_up_down(gpio, pigpio.PUD_OFF)
+        pi.set_watchdog(gpio, 0)
+        self._cb = pi.callback(gpio, pigpio.EITHER_EDGE, self._edge)
+    
+    def _edge(self, gpio, level, tick):
+        if level == 1:
+            self._high_tick = tick
+            return
+        
+        if level == pigpio.TIMEOUT:
+            # Line went quiet: frame finished or the sensor didn't answer
+            self.pi.set_watchdog(self.gpio, 0)
+            self._frame_done.set()
+            return
+        
+        # Falling edge. The first three belong to the host start pulse,
+        # its release and the sensor's 80us response; then 40 data bits
+        # whose value is the length of the preceding high pulse.
+        if self._bit < 0:
+            self._bit += 1
+            return
+        if self._bit >= 40:
+            return
+        
+        high = pigpio.tickDiff(self._high_tick, tick)
+        self._data = (self._data << 1) | (1 if high > 50 else 0)
+        self._bit += 1
+        if self._bit == 40:
+            self._decode()
+    
+    def _decode(self):
+        d = self._data
+        hh, hl, th, tl, checksum = [(d >> s) & 0xFF for s in (32, 24, 16, 8, 0)]
+        if ((hh + hl + th + tl) & 0xFF) == checksum:
+            self.humidity = ((hh << 8) | hl) / 10.0
+            temperature = (((th & 0x7F) << 8) | tl) / 10.0
+            self.temperature = -temperature if th & 0x80 else temperature
+            self.last_update = time.monotonic()
+        self._frame_done.set()
+    
+    def trigger(self):
+        """Send the start pulse; the frame is decoded from callbacks"""
+        self._frame_done.clear()
+        self._bit = -3
+        self._data = 0
+        self.pi.write(self.gpio, pigpio.LOW)
+        time.sleep(_DHT22_START_PULSE)
+        self.pi.set_mode(self.gpio, pigpio.INPUT)
+        self.pi.set_watchdog(self.gpio, 50)
+    
+    def read(self, timeout: float = 0.1) -> tuple[Optional[float], Optional[float]]:
+        """
+        Return the latest temperature and humidity
+        
+        Starts a new conversion at most every CFG.DHT_MIN_INTERVAL seconds and
+        waits briefly for it; readings older than CFG.DHT_MAX_AGE are dropped.
+        """
+        now = time.monotonic()
+        if self._last_trigger is None or now - self._last_trigger >= CFG.DHT_MIN_INTERVAL:
+            self._last_trigger = now
+            self.trigger()
+            self._frame_done.wait(timeout)
+        
+        if self.last_update is None or time.monotonic() - self.last_update > CFG.DHT_MAX_AGE:
+            return None, None
+        return self.temperature, self.humidity
+    
+    def cancel(self):
+        self.pi.set_watchdog(self.gpio, 0)
+        self._cb.cancel()
 
 
 class SensorReader:
     """Handles reading from all connected sensors"""
     
-    def __init__(self, use_mock: bool = USE_MOCK_SENSORS):
+    def __init__(self, use_mock: bool = CFG.USE_MOCK_SENSORS):
         """
         Initialize sensor reader
         
@@ -31,6 +170,42 @@ class SensorReader:
         """
         self.use_mock = use_mock or not RPI_AVAILABLE
         self.gpio_initialized = False
+        self._gpio = None           # RPi.GPIO module, imported on real hardware only
+        self._spi = None
+        self._adc_bitbang = False
+        self._gpio_h = None         # lgpio chip handle for bit-banged ADC pins
+        self._pi = None
+        self._dht = None
+        # Latest (monotonic_ts, temp, humid) from the background sampler;
+        # replaced wholesale so readers never see a torn update
+        self._dht_snap = (None, None, None)
+        self._dht_thread = None
+        self._dht_stop = threading.Event()
+        # Set by invalidate() (and cleanup()) to cut the sampler's wait short
+        self._dht_wake = threading.Event()
+        # The ADC channels share one bus; the DHT read overlaps with them
+        self._adc_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='sensor')
+        # read_all() in progress for read_all_async() callers to share
+        self._inflight = None
+        # Fixed-schema template that read_all() fills in and copies out
+        self._reading = {'soil_pct': None, 'temperature_c': None, 'humidity_pct': None,
+                         'lux': None, 'timestamp': 0.0}
+        self._reading_lock = threading.Lock()
+        
+        # Mock samples (also used if GPIO init fails below). One urandom
+        # call fills the buffer; each mock read is then a single next()
+        self._mock_next = itertools.cycle(
+            array('H', os.urandom(2 * _MOCK_BUFFER_SIZE))).__next__
+        
+        if not self.use_mock:
+            try:
+                import RPi.GPIO as GPIO
+                import adafruit_dht
+                import board
+            except Exception as e:
+                logger.error("Error importing sensor libraries: %s", e)
+                self.use_mock = True
         
         if not self.use_mock:
             try:
@@ -43,114 +218,206 @@ class SensorReader:
                     pass
                 
                 GPIO.setwarnings(False)  # Suppress GPIO warnings
+                self._gpio = GPIO
                 self.gpio_initialized = True
-                print("✓ GPIO initialized")
+                logger.info("GPIO initialized")
             except Exception as e:
-                print(f"✗ Error initializing GPIO: {e}")
+                logger.error("Error initializing GPIO: %s", e)
                 self.use_mock = True
                 self.gpio_initialized = False
 
             # Initialize DHT sensor
-            try:
-                if DHT_SENSOR_TYPE == 22:
-                    self.dht_device = adafruit_dht.DHT22(getattr(board, f"D{DHT_PIN}"))
-                else:
-                    self.dht_device = adafruit_dht.DHT11(getattr(board, f"D{DHT_PIN}"))
-            except Exception as e:
-                print("Error initializing DHT sensor:", e)
-                self.dht_device = None
+            self.dht_device = None
+            if CFG.DHT_SENSOR_TYPE == 22 and PIGPIO_AVAILABLE:
+                self._init_pigpio_dht()
+            if self._dht is None:
+                try:
+                    if CFG.DHT_SENSOR_TYPE == 22:
+                        self.dht_device = adafruit_dht.DHT22(getattr(board, f"D{CFG.DHT_PIN}"))
+                    else:
+                        self.dht_device = adafruit_dht.DHT11(getattr(board, f"D{CFG.DHT_PIN}"))
+                except Exception as e:
+                    logger.error("Error initializing DHT sensor: %s", e)
+                    self.dht_device = None
+            
+            if self.dht_device is not None or self._dht is not None:
+                self._dht_thread = threading.Thread(target=self._dht_loop, name='dht-sampler', daemon=True)
+                self._dht_thread.start()
             
             # Initialize ADC for analog sensors if enabled
             self.adc_initialized = False
-            if ADC_ENABLED:
+            if CFG.ADC_ENABLED:
                 self._init_adc()
             else:
-                print("ADC disabled in config")
+                logger.info("ADC disabled in config")
         else:
             self.adc_initialized = False
             self.dht_device = None
         
         self.last_reading = None
-        print(f"SensorReader initialized (mock={'ON' if self.use_mock else 'OFF'})")
+        # Invalid readings in a row, as seen by is_reading_valid()
+        self.consecutive_invalid = 0
+        logger.info("SensorReader initialized (mock=%s)", 'ON' if self.use_mock else 'OFF')
+    
+    def _init_pigpio_dht(self):
+        """Attach the edge-timed DHT22 driver if pigpiod is running"""
+        pi = pigpio.pi()
+        if not pi.connected:
+            logger.warning("pigpiod not running, using adafruit_dht for DHT22")
+            return
+        
+        self._pi = pi
+        self._dht = _PigpioDHT22(pi, CFG.DHT_PIN)
+        logger.info("DHT22 initialized (pigpio)")
     
     def _init_adc(self):
-        """Initialize MCP3008 ADC for analog sensors"""
+        """
+        Initialize MCP3008 ADC for analog sensors
+        
+        Uses the kernel SPI driver (/dev/spidev) when available so the
+        BCM2835 SPI peripheral clocks the bits in hardware. Falls back to
+        bit-banging the SPI pins over GPIO if SPI is not enabled.
+        """
+        if SPIDEV_AVAILABLE:
+            try:
+                self._spi = spidev.SpiDev()
+                self._spi.open(CFG.ADC_SPI_BUS, CFG.ADC_SPI_DEVICE)
+                self._spi.max_speed_hz = CFG.ADC_SPI_SPEED_HZ
+                self._spi.mode = 0
+                
+                self.adc_initialized = True
+                logger.info("MCP3008 ADC initialized (hardware SPI)")
+                return
+            except OSError as e:
+                logger.warning("Hardware SPI unavailable (%s), falling back to GPIO bit-banging", e)
+                self._spi = None
+        
+        if LGPIO_AVAILABLE:
+            try:
+                # Claim CLK/MOSI/CS as one line group so each step of the
+                # bit-bang sets all three in a single ioctl
+                h = lgpio.gpiochip_open(CFG.GPIO_CHIP)
+                lgpio.group_claim_output(h, [CFG.ADC_CLK_PIN, CFG.ADC_MOSI_PIN, CFG.ADC_CS_PIN], [0, 0, 1])
+                lgpio.gpio_claim_input(h, CFG.ADC_MISO_PIN)
+                
+                group_write = partial(lgpio.group_write, h, CFG.ADC_CLK_PIN)
+                
+                def set_lines(clk, mosi, cs):
+                    group_write(clk | mosi << 1 | cs << 2)
+                
+                self._gpio_h = h
+                self._set_adc_lines = set_lines
+                self._pin_read = partial(lgpio.gpio_read, h)
+                self._adc_bitbang = True
+                self.adc_initialized = True
+                logger.info("MCP3008 ADC initialized (lgpio bit-banging)")
+                return
+            except lgpio.error as e:
+                logger.warning("lgpio unavailable (%s), falling back to RPi.GPIO", e)
+        
         if not self.gpio_initialized:
-            print("✗ GPIO not initialized, cannot setup ADC")
+            logger.error("GPIO not initialized, cannot setup ADC")
             self.adc_initialized = False
             return
             
+        GPIO = self._gpio
         try:
             # Set up GPIO pins for MCP3008 SPI communication with initial states
-            GPIO.setup(ADC_CLK_PIN, GPIO.OUT, initial=GPIO.LOW)
-            GPIO.setup(ADC_MISO_PIN, GPIO.IN)
-            GPIO.setup(ADC_MOSI_PIN, GPIO.OUT, initial=GPIO.LOW)
-            GPIO.setup(ADC_CS_PIN, GPIO.OUT, initial=GPIO.HIGH)
+            GPIO.setup(CFG.ADC_CLK_PIN, GPIO.OUT, initial=GPIO.LOW)
+            GPIO.setup(CFG.ADC_MISO_PIN, GPIO.IN)
+            GPIO.setup(CFG.ADC_MOSI_PIN, GPIO.OUT, initial=GPIO.LOW)
+            GPIO.setup(CFG.ADC_CS_PIN, GPIO.OUT, initial=GPIO.HIGH)
+            
+            out_pins = [CFG.ADC_CLK_PIN, CFG.ADC_MOSI_PIN, CFG.ADC_CS_PIN]
+            
+            def set_lines(clk, mosi, cs):
+                GPIO.output(out_pins, (clk, mosi, cs))
+            
+            self._set_adc_lines = set_lines
+            self._pin_read = GPIO.input
             
             # Store pin references
-            self.adc_clk = ADC_CLK_PIN
-            self.adc_miso = ADC_MISO_PIN
-            self.adc_mosi = ADC_MOSI_PIN
-            self.adc_cs = ADC_CS_PIN
+            self.adc_clk = CFG.ADC_CLK_PIN
+            self.adc_miso = CFG.ADC_MISO_PIN
+            self.adc_mosi = CFG.ADC_MOSI_PIN
+            self.adc_cs = CFG.ADC_CS_PIN
             
+            self._adc_bitbang = True
             self.adc_initialized = True
-            print("✓ MCP3008 ADC initialized successfully")
+            logger.info("MCP3008 ADC initialized (GPIO bit-banging)")
         except Exception as e:
-            print(f"✗ Error initializing ADC: {e}")
-            print("  Hint: Another process may be using GPIO pins")
+            logger.error("Error initializing ADC: %s", e)
+            logger.error("  Hint: Another process may be using GPIO pins")
             self.adc_initialized = False
     
+    def _mock_adc(self) -> int:
+        """Next pre-generated 10-bit mock ADC sample"""
+        return self._mock_next() & 0x3FF
+    
+    def _mock_uniform(self, low: float, high: float) -> float:
+        """Mock value in [low, high] drawn from the sample buffer"""
+        return low + (high - low) * (self._mock_adc() / 1023.0)
+    
     def _read_adc(self, channel: int) -> int:
-        """Read from MCP3008 ADC channel with proper timing"""
+        """Read from MCP3008 ADC channel"""
         if self.use_mock:
-            return random.randint(0, 1023)
+            return self._mock_adc()
         
         if not self.adc_initialized:
-            print("ADC not initialized, using default value")
+            logger.debug("ADC not initialized, using default value")
             return 0
         
+        sample = self._read_adc_bitbang if self._adc_bitbang else self._read_adc_spi
+        with self._adc_lock:
+            if CFG.ADC_SAMPLES <= 1:
+                return sample(channel)
+            # Median of a few back-to-back conversions, so a single
+            # noise spike can't turn into a bogus moisture/light reading
+            samples = sorted(sample(channel) for _ in range(CFG.ADC_SAMPLES))
+            return samples[len(samples) // 2]
+    
+    def _read_adc_spi(self, channel: int) -> int:
+        """Read from MCP3008 ADC channel over hardware SPI"""
         try:
-            # Ensure clean state before starting
-            time.sleep(0.001)  # 1ms settling time
-            
-            # Start communication - bring CS low
-            GPIO.output(ADC_CS_PIN, GPIO.HIGH)
-            time.sleep(0.0001)  # 100μs
-            GPIO.output(ADC_CLK_PIN, GPIO.LOW)
-            GPIO.output(ADC_CS_PIN, GPIO.LOW)
+            # Start bit, single-ended mode + channel, then clock out 10 result bits
+            r = self._spi.xfer2([1, (8 + channel) << 4, 0])
+            return ((r[1] & 0x03) << 8) | r[2]
+        except OSError as e:
+            logger.debug("Error reading ADC channel %d: %s", channel, e)
+            return 0
+    
+    def _read_adc_bitbang(self, channel: int) -> int:
+        """Read from MCP3008 ADC channel by bit-banging SPI over GPIO"""
+        set_lines = self._set_adc_lines
+        read = self._pin_read
+        miso = CFG.ADC_MISO_PIN
+        # No explicit delays: each Python-level pin write already takes far
+        # longer than the MCP3008's ~100ns clock and ~270ns CS timing minimums,
+        # and time.sleep() of a few µs actually yields for 50-100µs on Linux
+        try:
+            # Start communication - CLK low, then bring CS low
+            set_lines(0, 0, 1)
+            set_lines(0, 0, 0)
             
-            # Send start bit, single-ended mode, and channel
-            command = channel
-            command |= 0x18  # Start bit + single-ended
-            command <<= 3
-            
-            # Send command bits
-            for i in range(5):
-                if command & 0x80:
-                    GPIO.output(ADC_MOSI_PIN, GPIO.HIGH)
-                else:
-                    GPIO.output(ADC_MOSI_PIN, GPIO.LOW)
-                command <<= 1
-                
-                # Clock pulse with delay
-                time.sleep(0.00001)  # 10μs
-                GPIO.output(ADC_CLK_PIN, GPIO.HIGH)
-                time.sleep(0.00001)  # 10μs
-                GPIO.output(ADC_CLK_PIN, GPIO.LOW)
+            # Send start bit, single-ended mode, and channel. MOSI changes
+            # together with the falling clock edge, the MCP3008 samples it
+            # on the rising edge
+            for mosi in _ADC_COMMAND_BITS[channel]:
+                set_lines(0, mosi, 0)
+                set_lines(1, mosi, 0)
+            set_lines(0, 0, 0)
             
             # Read result bits (10-bit ADC = 10 bits, but we read 12 for alignment)
             result = 0
             for i in range(12):
-                time.sleep(0.00001)  # 10μs
-                GPIO.output(ADC_CLK_PIN, GPIO.HIGH)
-                time.sleep(0.00001)  # 10μs
-                GPIO.output(ADC_CLK_PIN, GPIO.LOW)
+                set_lines(1, 0, 0)
+                set_lines(0, 0, 0)
                 result <<= 1
-                if GPIO.input(ADC_MISO_PIN):
+                if read(miso):
                     result |= 0x1
             
             # End communication - bring CS high
-            GPIO.output(ADC_CS_PIN, GPIO.HIGH)
+            set_lines(0, 0, 1)
             
             # Shift result and mask to 10 bits
             result >>= 1
@@ -159,42 +426,76 @@ class SensorReader:
             return result
             
         except Exception as e:
-            print(f"Error reading ADC channel {channel}: {e}")
+            logger.debug("Error reading ADC channel %d: %s", channel, e)
             return 0
     
     def read_soil_moisture(self) -> Optional[float]:
         """Read soil moisture from MCP3008 CH1"""
-        if not ENABLE_SOIL_SENSOR:
+        if not CFG.ENABLE_SOIL_SENSOR:
             return None
         
         if self.use_mock:
-            return round(random.uniform(30, 70), 1)
+            return round(self._mock_uniform(30, 70), 1)
         
         try:
-            raw_value = self._read_adc(SOIL_MOISTURE_CHANNEL)
-            # Convert to percentage (higher ADC = drier soil, so invert)
-            percentage = 100 - ((raw_value / 1023.0) * 100)
-            percentage = max(0, min(100, percentage))
-            return round(percentage, 1)
-            
+            return _SOIL_PCT_LUT[self._read_adc(CFG.SOIL_MOISTURE_CHANNEL)]
         except Exception as e:
-            print(f"Error reading soil moisture: {e}")
+            logger.error("Error reading soil moisture: %s", e)
             return None
     
     def read_temperature_humidity(self) -> tuple[Optional[float], Optional[float]]:
-        """Read temperature & humidity from DHT22"""
+        """Latest temperature & humidity published by the DHT sampler thread"""
         if self.use_mock:
-            temp = round(random.uniform(18, 28), 1) if ENABLE_TEMPERATURE_SENSOR else None
-            humid = round(random.uniform(40, 70), 1) if ENABLE_HUMIDITY_SENSOR else None
+            temp = round(self._mock_uniform(18, 28), 1) if CFG.ENABLE_TEMPERATURE_SENSOR else None
+            humid = round(self._mock_uniform(40, 70), 1) if CFG.ENABLE_HUMIDITY_SENSOR else None
             return temp, humid
         
-        if not self.dht_device:
-            print("DHT22 not initialized")
+        if self._dht_thread is None:
+            logger.debug("DHT22 not initialized")
             return None, None
-
+        
+        ts, temp, humid = self._dht_snap
+        if ts is None or time.monotonic() - ts > 2 * CFG.DHT_SAMPLE_INTERVAL:
+            return None, None
+        return temp, humid
+    
+    def invalidate(self):
+        """
+        Have the DHT sampler take a fresh reading ahead of schedule
+        
+        Call after something changes the microclimate (e.g. watering); the
+        new reading replaces the snapshot within about DHT_MIN_INTERVAL.
+        """
+        self._dht_wake.set()
+    
+    def _dht_loop(self):
+        """Sample the DHT every DHT_SAMPLE_INTERVAL until cleanup()"""
+        while True:
+            last_read = time.monotonic()
+            temp, humid = self._raw_read_dht()
+            if temp is not None or humid is not None:
+                self._dht_snap = (time.monotonic(), temp, humid)
+                delay = CFG.DHT_SAMPLE_INTERVAL
+            else:
+                # Bad frame or checksum: retry as soon as the sensor allows
+                # rather than leaving the snapshot to go stale
+                delay = CFG.DHT_MIN_INTERVAL
+            self._dht_wake.wait(delay)
+            self._dht_wake.clear()
+            
+            # Woken early by invalidate(): the sensor still needs its rest
+            rest = CFG.DHT_MIN_INTERVAL - (time.monotonic() - last_read)
+            if self._dht_stop.wait(max(0.0, rest)):
+                break
+    
+    def _raw_read_dht(self) -> tuple[Optional[float], Optional[float]]:
+        """Read temperature & humidity directly from the DHT22"""
         try:
-            temperature = self.dht_device.temperature
-            humidity = self.dht_device.humidity
+            if self._dht is not None:
+                temperature, humidity = self._dht.read()
+            else:
+                temperature = self.dht_device.temperature
+                humidity = self.dht_device.humidity
 
             if humidity is not None and (humidity < 0 or humidity > 100):
                 humidity = None
@@ -207,96 +508,215 @@ class SensorReader:
             return temp, humid
             
         except Exception as e:
-            print(f"Error reading DHT sensor: {e}")
+            logger.debug("Error reading DHT sensor: %s", e)
             return None, None
     
     def read_light_level(self) -> Optional[float]:
         """Read LDR light level from MCP3008 CH0"""
-        if not ENABLE_LIGHT_SENSOR:
+        if not CFG.ENABLE_LIGHT_SENSOR:
             return None
         
         if self.use_mock:
-            return round(random.uniform(200, 1500), 0)
+            return round(self._mock_uniform(200, 1500), 0)
         
         try:
-            raw_value = self._read_adc(LIGHT_SENSOR_CHANNEL)
-            # Convert ADC value to lux (higher ADC = brighter)
-            lux = (raw_value / 1023.0) * 2000
-            return round(lux, 0)
-            
+            return _LUX_LUT[self._read_adc(CFG.LIGHT_SENSOR_CHANNEL)]
         except Exception as e:
-            print(f"Error reading light level: {e}")
+            logger.error("Error reading light level: %s", e)
             return None
     
     def read_all(self) -> Dict:
-        """Read all sensors"""
-        temperature, humidity = self.read_temperature_humidity()
+        """Read all sensors concurrently"""
+        futs = {k: self._pool.submit(fn) for k, fn in [
+            ('soil_pct', self.read_soil_moisture),
+            ('th', self.read_temperature_humidity),
+            ('lux', self.read_light_level),
+        ]}
+        temperature, humidity = futs['th'].result()
+        soil = futs['soil_pct'].result()
+        lux = futs['lux'].result()
         
-        reading = {
-            'soil_pct': self.read_soil_moisture(),
-            'temperature_c': temperature,
-            'humidity_pct': humidity,
-            'lux': self.read_light_level(),
-            'timestamp': time.time()
-        }
+        # Copying a same-shaped dict reuses its key table; callers get their
+        # own snapshot so the template can be refilled next cycle
+        with self._reading_lock:
+            template = self._reading
+            template['soil_pct'] = soil
+            template['temperature_c'] = temperature
+            template['humidity_pct'] = humidity
+            template['lux'] = lux
+            template['timestamp'] = time.time()
+            reading = template.copy()
         
         self.last_reading = reading
         
-        if DEBUG_MODE:
-            print(f"Sensor readings: {reading}")
+        logger.debug("Sensor readings: %s", reading)
         
         return reading
     
+    async def read_all_async(self) -> Dict:
+        """
+        Read all sensors without blocking the event loop
+        
+        Concurrent callers await the same in-flight read_all() rather than
+        each hitting the hardware.
+        """
+        fut = self._inflight
+        if fut is None:
+            # Default executor: read_all() itself blocks on self._pool
+            fut = asyncio.get_running_loop().run_in_executor(None, self.read_all)
+            fut.add_done_callback(self._clear_inflight)
+            self._inflight = fut
+        # Shield so one caller being cancelled doesn't cancel the others' read
+        return await asyncio.shield(fut)
+    
+    def _clear_inflight(self, fut):
+        if self._inflight is fut:
+            self._inflight = None
+    
     def is_reading_valid(self, reading: Dict) -> bool:
-        """Validate reading"""
-        if not ENABLE_SAFETY_CHECKS:
+        """Validate reading, updating consecutive_invalid"""
+        valid = self._check_reading(reading)
+        self.consecutive_invalid = 0 if valid else self.consecutive_invalid + 1
+        return valid
+    
+    def _check_reading(self, reading: Dict) -> bool:
+        """Range and safety checks behind is_reading_valid()"""
+        if not CFG.ENABLE_SAFETY_CHECKS:
             return True
         
-        has_data = any(v is not None for k, v in reading.items() if k != 'timestamp')
+        temperature = reading['temperature_c']
+        humidity = reading['humidity_pct']
+        
+        has_data = (reading['soil_pct'] is not None or
+                    temperature is not None or
+                    humidity is not None or
+                    reading['lux'] is not None)
         if not has_data:
-            print("Warning: No valid sensor data")
+            logger.warning("No valid sensor data")
             return False
         
-        if reading.get('temperature_c') is not None:
-            if reading['temperature_c'] > SAFETY_MAX_TEMP:
-                print(f"SAFETY: Temperature too high: {reading['temperature_c']}°C")
-                return False
+        if temperature is not None and temperature > CFG.SAFETY_MAX_TEMP:
+            logger.warning("SAFETY: Temperature too high: %s°C", temperature)
+            return False
         
-        if reading.get('humidity_pct') is not None:
-            if reading['humidity_pct'] > SAFETY_MAX_HUMIDITY:
-                print(f"SAFETY: Humidity too high: {reading['humidity_pct']}%")
-                return False
+        if humidity is not None and humidity > CFG.SAFETY_MAX_HUMIDITY:
+            logger.warning("SAFETY: Humidity too high: %s%%", humidity)
+            return False
         
         return True
     
     def cleanup(self):
-        """Cleanup GPIO resources"""
+        """Cleanup SPI and GPIO resources"""
+        self._pool.shutdown(wait=True)
+        
+        if self._dht_thread is not None:
+            self._dht_stop.set()
+            self._dht_wake.set()
+            self._dht_thread.join(timeout=5)
+            self._dht_thread = None
+        
+        if self._spi is not None:
+            self._spi.close()
+            self._spi = None
+            self.adc_initialized = False
+        
+        if self._gpio_h is not None:
+            lgpio.group_free(self._gpio_h, CFG.ADC_CLK_PIN)
+            lgpio.gpio_free(self._gpio_h, CFG.ADC_MISO_PIN)
+            lgpio.gpiochip_close(self._gpio_h)
+            self._gpio_h = None
+            self._adc_bitbang = False
+            self.adc_initialized = False
+        
+        if self._dht is not None:
+            self._dht.cancel()
+            self._dht = None
+        if self._pi is not None:
+            self._pi.stop()
+            self._pi = None
+        
+        # adafruit_dht holds the pin through its own pulse reader, not RPi.GPIO
+        if self.dht_device is not None:
+            try:
+                self.dht_device.exit()
+            except Exception as e:
+                logger.warning("DHT cleanup error: %s", e)
+            self.dht_device = None
+        
         if not self.use_mock and RPI_AVAILABLE and self.gpio_initialized:
             try:
                 # Only cleanup sensor-specific pins, not all GPIO
                 # This prevents interfering with pump or other modules
-                if self.adc_initialized:
-                    GPIO.cleanup([ADC_CLK_PIN, ADC_MISO_PIN, ADC_MOSI_PIN, ADC_CS_PIN])
-                if self.dht_initialized:
-                    GPIO.cleanup(DHT_PIN)
-                print("✓ Sensor GPIO cleanup completed")
+                if self._adc_bitbang:
+                    self._gpio.cleanup([CFG.ADC_CLK_PIN, CFG.ADC_MISO_PIN, CFG.ADC_MOSI_PIN, CFG.ADC_CS_PIN])
+                logger.info("Sensor GPIO cleanup completed")
                 self.gpio_initialized = False
                 self.adc_initialized = False
             except Exception as e:
-                print(f"⚠ GPIO cleanup error: {e}")
+                logger.warning("GPIO cleanup error: %s", e)
 
 
-if __name__ == "__main__":
+# Display units for the self-test output
+_UNITS = {'soil_pct': '%', 'temperature_c': '°C', 'humidity_pct': '%', 'lux': ' lux'}
+
+
+async def _selftest():
+    """Exercise the sensor reader in mock mode"""
     print("Testing sensor reader...")
     sensor = SensorReader(use_mock=True)
     
-    for i in range(5):
-        print(f"\nReading {i+1}:")
-        data = sensor.read_all()
-        for key, value in data.items():
-            if value is not None:
-                print(f"  {key}: {value}")
-        time.sleep(2)
+    # Output goes through a bounded buffer to a printer thread, so a slow
+    # console never delays the next reading (the oldest lines are dropped
+    # if the console falls 64 readings behind)
+    lines = deque(maxlen=64)
+    pending = threading.Event()
+    finished = threading.Event()
     
-    sensor.cleanup()
+    def printer():
+        while not (finished.is_set() and not lines):
+            pending.wait()
+            pending.clear()
+            while lines:
+                print(lines.popleft())
+    
+    printer_thread = threading.Thread(target=printer, name='selftest-printer', daemon=True)
+    printer_thread.start()
+    
+    # Readings start every DHT_MIN_INTERVAL; time spent reading and
+    # printing comes out of the wait rather than adding to it. After an
+    # invalid reading, retry sooner (0.1 s, doubling back up to the normal
+    # interval); the DHT sampler refreshes failed frames on its own.
+    try:
+        for i in range(5):
+            started = time.monotonic()
+            data = await sensor.read_all_async()
+            valid = sensor.is_reading_valid(data)
+            
+            out = [f"\nReading {i+1}:"]
+            for key, value in data.items():
+                if value is not None:
+                    out.append(f"  {key}: {value}{_UNITS.get(key, '')}")
+            out.append(f"  Valid: {'✓ Yes' if valid else '✗ No'}")
+            lines.append("\n".join(out))
+            pending.set()
+            
+            failures = sensor.consecutive_invalid
+            interval = CFG.DHT_MIN_INTERVAL
+            if failures:
+                interval = min(interval, 0.1 * 2 ** (failures - 1))
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        # Drain whatever is still buffered before reporting
+        finished.set()
+        pending.set()
+        printer_thread.join()
+        sensor.cleanup()
     print("Test complete!")
+
+
+if __name__ == "__main__":
+    # Headless Pis often run with an ASCII locale; replace the ✓/° glyphs
+    # there rather than raising UnicodeEncodeError mid-test
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    logging.basicConfig(level=logging.DEBUG if CFG.DEBUG_MODE else logging.INFO)
+    asyncio.run(_selftest())
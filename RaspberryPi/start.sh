@@ -43,7 +43,7 @@ echo "4. Starting Plant Monitoring System..."
 echo "=========================================="
 echo ""
 
-python3 main.py
+python3 -O main.py
 
 # Cleanup on exit
 echo ""
@@ -0,0 +1,81 @@
+"""
+Persistent telemetry buffer for Raspberry Pi Plant Monitoring System
+Keeps unsent telemetry samples in SQLite so they survive reboots and outages
+"""
+
+import sqlite3
+import threading
+from typing import List, Tuple
+
+import orjson
+
+
+class TelemetryBuffer:
+    """Bounded FIFO of telemetry samples stored in a WAL-mode SQLite table"""
+
+    def __init__(self, path: str, max_rows: int):
+        """
+        Open (or create) the buffer database
+
+        Args:
+            path: SQLite database file (':memory:' for a non-persistent buffer)
+            max_rows: Maximum samples kept; the oldest are dropped first
+        """
+        # Reentrant: a shutdown signal can flush while append() holds it
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+
+        # WAL + NORMAL: each insert is a cheap append, still crash-safe
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS telemetry_pending ("
+            "id INTEGER PRIMARY KEY, payload BLOB NOT NULL)"
+        )
+
+        # Ring behaviour: trim the oldest rows beyond max_rows on every insert.
+        # Recreated each start so a changed TELEMETRY_QUEUE_SIZE takes effect.
+        self._db.execute("DROP TRIGGER IF EXISTS telemetry_pending_cap")
+        self._db.execute(
+            "CREATE TRIGGER telemetry_pending_cap AFTER INSERT ON telemetry_pending "
+            f"BEGIN DELETE FROM telemetry_pending WHERE id <= NEW.id - {int(max_rows)}; END"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM telemetry_pending").fetchone()[0]
+
+    def append(self, sample: dict):
+        """Store one sample"""
+        payload = orjson.dumps(sample)
+        with self._lock:
+            self._db.execute("INSERT INTO telemetry_pending (payload) VALUES (?)", (payload,))
+
+    def peek(self, limit: int) -> Tuple[int, List[bytes]]:
+        """
+        Oldest samples without removing them
+
+        Args:
+            limit: Maximum number of samples to return
+
+        Returns:
+            Tuple of (id of the last returned row, JSON-encoded samples);
+            the id is 0 when the buffer is empty
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload FROM telemetry_pending ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        if not rows:
+            return 0, []
+        return rows[-1][0], [payload for _, payload in rows]
+
+    def remove_through(self, last_id: int):
+        """Delete every sample up to and including last_id (after a successful upload)"""
+        with self._lock:
+            self._db.execute("DELETE FROM telemetry_pending WHERE id <= ?", (last_id,))
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
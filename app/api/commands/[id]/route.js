@@ -1,6 +1,7 @@
 // app/api/commands/[id]/route.js
 import { NextResponse } from 'next/server';
 import { updateCommandStatus, getCommandById } from '../../../../services/deviceService.js';
+import { readJsonBody } from '../../../../lib/requestBody.js';
 
 /**
  * POST /api/commands/:id
@@ -9,6 +10,7 @@ import { updateCommandStatus, getCommandById } from '../../../../services/device
  * Body:
  * - status: 'started'|'completed'|'failed'
  * - result: object (optional, execution details)
+ * Body may be gzip-compressed (Content-Encoding: gzip)
  * 
  * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
  */
@@ -34,7 +36,7 @@ export async function POST(request, { params }) {
     }
 
     const commandId = params.id;
-    const body = await request.json();
+    const body = await readJsonBody(request);
     
     const { status, result } = body;
 
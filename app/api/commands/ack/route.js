@@ -0,0 +1,88 @@
+// app/api/commands/ack/route.js
+import { NextResponse } from 'next/server';
+import { updateCommandStatus } from '../../../../services/deviceService.js';
+import { readJsonBody } from '../../../../lib/requestBody.js';
+
+const VALID_STATUSES = ['started', 'completed', 'failed'];
+
+/**
+ * POST /api/commands/ack
+ * Acknowledge several commands in one request
+ *
+ * Request body:
+ * {
+ *   acks: [
+ *     {
+ *       id: string,
+ *       status: 'started'|'completed'|'failed',
+ *       result?: object (execution details)
+ *     }
+ *   ]
+ * }
+ * Body may be gzip-compressed (Content-Encoding: gzip)
+ *
+ * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
+ */
+export async function POST(request) {
+  try {
+    // Check device authentication
+    const authHeader = request.headers.get('authorization');
+    const DEVICE_TOKEN_SECRET = process.env.DEVICE_TOKEN_SECRET || '';
+
+    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+      return NextResponse.json({
+        error: 'Unauthorized',
+        message: 'Missing or invalid Authorization header',
+      }, { status: 401 });
+    }
+
+    const token = authHeader.substring(7);
+    if (token !== DEVICE_TOKEN_SECRET) {
+      return NextResponse.json({
+        error: 'Unauthorized',
+        message: 'Invalid device token',
+      }, { status: 401 });
+    }
+
+    const body = await readJsonBody(request);
+    const acks = Array.isArray(body.acks) ? body.acks : [];
+
+    if (acks.length === 0) {
+      return NextResponse.json({
+        error: 'Bad Request',
+        message: 'acks must be a non-empty array',
+      }, { status: 400 });
+    }
+
+    if (acks.some((ack) => !ack.id || !VALID_STATUSES.includes(ack.status))) {
+      return NextResponse.json({
+        error: 'Bad Request',
+        message: 'Each ack needs an id and a status of: started, completed, or failed',
+      }, { status: 400 });
+    }
+
+    // Apply in order; a command that no longer exists doesn't fail the others
+    const failed = [];
+    for (const ack of acks) {
+      try {
+        await updateCommandStatus(ack.id, ack.status, ack.result);
+      } catch (error) {
+        failed.push(ack.id);
+      }
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        count: acks.length - failed.length,
+        failed,
+      },
+    }, { status: 200 });
+  } catch (error) {
+    console.error('Batch command acknowledgment error:', error);
+    return NextResponse.json({
+      error: 'Internal Server Error',
+      message: error.message,
+    }, { status: 500 });
+  }
+}
@@ -2,12 +2,23 @@
 import { NextResponse } from 'next/server';
 import { getQueuedCommands } from '../../../services/deviceService.js';
 
+// Long-poll limits: hold the request open for at most this long,
+// re-checking the queue once per interval. Each re-check is a DB query, so
+// a full idle wait costs about 6 queries; a command queued meanwhile is
+// delivered within one interval.
+const MAX_WAIT_SECONDS = 25;
+const WAIT_POLL_INTERVAL_MS = 5000;
+
+export const maxDuration = 30;
+
 /**
  * GET /api/commands
  * Device polling endpoint to check for queued commands
  * 
  * Query params:
  * - device_id: string (required)
+ * - wait: number (optional, seconds) - long-poll: hold the request open until
+ *   a command is queued or this many seconds pass (max 25)
  * 
  * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
  */
@@ -36,8 +47,16 @@ export async function GET(request) {
     const { searchParams } = new URL(request.url);
     const deviceId = searchParams.get('device_id') || 'default-device';
 
-    // Get queued commands
-    const commands = await getQueuedCommands(deviceId);
+    const wait = Math.min(Math.max(parseInt(searchParams.get('wait'), 10) || 0, 0), MAX_WAIT_SECONDS);
+    const deadline = Date.now() + wait * 1000;
+
+    // Get queued commands, waiting for one to arrive when long-polling
+    let commands = await getQueuedCommands(deviceId);
+    while (commands.length === 0 && Date.now() < deadline) {
+      const pause = Math.min(WAIT_POLL_INTERVAL_MS, deadline - Date.now());
+      await new Promise((resolve) => setTimeout(resolve, pause));
+      commands = await getQueuedCommands(deviceId);
+    }
 
     return NextResponse.json({
       success: true,
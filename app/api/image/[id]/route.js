@@ -18,11 +18,13 @@ export async function GET(request, { params }) {
       }, { status: 400 });
     }
 
-    // Get image with detections
+    // Get image with detections, highest confidence first (the Pi takes
+    // detections[0] as the dominant plant)
     const image = await prisma.image.findUnique({
       where: { id: imageId },
       include: {
         detections: {
+          orderBy: { confidence: 'desc' },
           include: {
             plantType: true,
             plantData: true,
@@ -43,13 +45,8 @@ export async function GET(request, { params }) {
     const isProcessed = !!image.inferenceCache;
     const hasDetections = image.detections.length > 0;
 
-    // Find dominant detection
-    let dominantDetection = null;
-    if (hasDetections) {
-      dominantDetection = image.detections.reduce((max, det) => 
-        det.confidence > (max?.confidence || 0) ? det : max
-      , null);
-    }
+    // Dominant detection is the first one
+    const dominantDetection = hasDetections ? image.detections[0] : null;
 
     const response = {
       success: true,
@@ -70,7 +70,7 @@ async function processImageAI(imageId, imageUrl) {
  * 
  * Form data:
  * - device_id: string
- * - timestamp: string (ISO 8601)
+ * - timestamp: string (ISO 8601 or epoch milliseconds)
  * - image: file
  * 
  * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
@@ -100,7 +100,10 @@ export async function POST(request) {
     const formData = await request.formData();
     const imageFile = formData.get('image');
     const deviceId = formData.get('device_id') || 'default-device';
-    const timestamp = formData.get('timestamp') ? new Date(formData.get('timestamp')) : new Date();
+    const rawTimestamp = formData.get('timestamp');
+    const timestamp = rawTimestamp
+      ? new Date(/^\d+$/.test(rawTimestamp) ? Number(rawTimestamp) : rawTimestamp)
+      : new Date();
 
     if (!imageFile) {
       return NextResponse.json({
@@ -0,0 +1,89 @@
+// app/api/telemetry/batch/route.js
+import { NextResponse } from 'next/server';
+import prisma from '../../../../lib/prisma.js';
+import { readJsonBody } from '../../../../lib/requestBody.js';
+
+/**
+ * POST /api/telemetry/batch
+ * Accept several buffered sensor readings from a Raspberry Pi in one request
+ * 
+ * Request body:
+ * {
+ *   device_id?: string,
+ *   samples: [
+ *     {
+ *       timestamp?: string (ISO 8601) | number (epoch ms),
+ *       soil_pct?: number,
+ *       temperature_c?: number,
+ *       humidity_pct?: number,
+ *       lux?: number
+ *     }
+ *   ]
+ * }
+ * Body may be gzip-compressed (Content-Encoding: gzip)
+ * 
+ * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
+ */
+export async function POST(request) {
+  try {
+    // Check device authentication
+    const authHeader = request.headers.get('authorization');
+    const DEVICE_TOKEN_SECRET = process.env.DEVICE_TOKEN_SECRET || '';
+
+    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+      return NextResponse.json({
+        error: 'Unauthorized',
+        message: 'Missing or invalid Authorization header',
+      }, { status: 401 });
+    }
+
+    const token = authHeader.substring(7);
+    if (token !== DEVICE_TOKEN_SECRET) {
+      return NextResponse.json({
+        error: 'Unauthorized',
+        message: 'Invalid device token',
+      }, { status: 401 });
+    }
+
+    const data = await readJsonBody(request);
+    const samples = Array.isArray(data.samples) ? data.samples : [];
+
+    if (samples.length === 0) {
+      return NextResponse.json({
+        error: 'Bad Request',
+        message: 'samples must be a non-empty array',
+      }, { status: 400 });
+    }
+
+    const deviceId = data.device_id || 'default-device';
+
+    // Insert all readings in a single statement
+    const result = await prisma.reading.createMany({
+      data: samples.map((sample) => ({
+        deviceId,
+        timestamp: sample.timestamp ? new Date(sample.timestamp) : new Date(),
+        soilPct: sample.soil_pct,
+        temperatureC: sample.temperature_c,
+        humidityPct: sample.humidity_pct,
+        lux: sample.lux,
+        rawPayload: sample,
+      })),
+    });
+
+    console.log(`Telemetry batch received from device ${deviceId}: ${result.count} reading(s)`);
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        count: result.count,
+        message: 'Telemetry batch received successfully',
+      },
+    }, { status: 201 });
+  } catch (error) {
+    console.error('Telemetry batch endpoint error:', error);
+    return NextResponse.json({
+      error: 'Internal Server Error',
+      message: error.message,
+    }, { status: 500 });
+  }
+}
@@ -1,6 +1,7 @@
 // app/api/telemetry/route.js
 import { NextResponse } from 'next/server';
 import prisma from '../../../lib/prisma.js';
+import { readJsonBody } from '../../../lib/requestBody.js';
 
 /**
  * POST /api/telemetry
@@ -9,7 +10,7 @@ import prisma from '../../../lib/prisma.js';
  * Request body:
  * {
  *   device_id?: string,
- *   timestamp?: string (ISO 8601),
+ *   timestamp?: string (ISO 8601) | number (epoch ms),
  *   soil_pct?: number,
  *   temperature_c?: number,
  *   humidity_pct?: number,
@@ -18,6 +19,8 @@ import prisma from '../../../lib/prisma.js';
  *   raw_payload?: object
  * }
  * 
+ * Body may be gzip-compressed (Content-Encoding: gzip)
+ *
  * Requires: Authorization: Bearer <DEVICE_TOKEN_SECRET>
  */
 export async function POST(request) {
@@ -42,7 +45,7 @@ export async function POST(request) {
     }
 
     // Parse and validate request body
-    const data = await request.json();
+    const data = await readJsonBody(request);
 
     // Insert reading into database
     const reading = await prisma.reading.create({
@@ -0,0 +1,20 @@
+// lib/requestBody.js
+import { gunzipSync } from 'zlib';
+
+/**
+ * Parse a JSON request body, inflating it first when the device sent it
+ * with Content-Encoding: gzip (telemetry and command acknowledgments)
+ *
+ * @param {Request} request - Incoming route handler request
+ * @returns {Promise<any>} Parsed JSON body
+ */
+export async function readJsonBody(request) {
+  const encoding = (request.headers.get('content-encoding') || '').toLowerCase();
+
+  if (encoding === 'gzip') {
+    const raw = Buffer.from(await request.arrayBuffer());
+    return JSON.parse(gunzipSync(raw).toString('utf8'));
+  }
+
+  return request.json();
+}
@@ -106,6 +106,7 @@ export async function inferByUrl(imageUrl) {
 /**
  * Normalize Gradio response to standard format
  * The Gradio /predict endpoint returns data in various formats
+ * Detections are returned sorted by confidence, highest first
  */
 function normalizeGradioResponse(responseData) {
   const detections = [];
@@ -173,6 +174,9 @@ function normalizeGradioResponse(responseData) {
     });
   }
 
+  // Highest confidence first: clients take detections[0] as the dominant plant
+  detections.sort((a, b) => b.confidence - a.confidence);
+
   console.log('=== DETECTIONS RESULT ===');
   console.log('Count:', detections.length);
   console.log('Detections:', JSON.stringify(detections, null, 2));
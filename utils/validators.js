@@ -6,7 +6,7 @@ const { z } = require('zod');
  */
 const telemetrySchema = z.object({
   device_id: z.string().optional(),
-  timestamp: z.string().datetime().optional(),
+  timestamp: z.union([z.string().datetime(), z.number().int()]).optional(),
   soil_pct: z.number().min(0).max(100).optional(),
   temperature_c: z.number().min(-50).max(100).optional(),
   humidity_pct: z.number().min(0).max(100).optional(),
@@ -28,7 +28,7 @@ const waterControlSchema = z.object({
  */
 const commandAckSchema = z.object({
   status: z.enum(['started', 'completed', 'failed']),
-  timestamp: z.string().datetime().optional(),
+  timestamp: z.union([z.string().datetime(), z.number().int()]).optional(),
   result: z.record(z.string(), z.any()).optional(),
 });
 